@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Weather Advice Engine Module
+Classifies whole forecast horizons (or many locations) against the
+WeatherAppConfig threshold tables in one vectorized pass
+
+Developed by hafizullahkhokhar1
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from config import WeatherAppConfig
+from conditions import ADVICE_KEYS, Condition, classify_text
+
+
+def compile_thresholds(thresholds: Dict[str, float]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Turn a {category: lower_bound} table into (boundaries, labels) for searchsorted
+    The category with the lowest bound is the catch-all below every other
+    bound, matching the WeatherAppConfig.get_*_category helpers
+    """
+    ordered = sorted(thresholds.items(), key=lambda item: item[1])
+    labels = [name for name, _ in ordered]
+    boundaries = np.array([bound for _, bound in ordered[1:]], dtype=np.float64)
+    return boundaries, labels
+
+
+class AdviceEngine:
+    """
+    Vectorized advice over arrays of observations
+    Each table yields an integer code per timestep; text is rendered once
+    per distinct combination of codes and then gathered
+    """
+
+    # Categories that are unremarkable enough to leave out of the text
+    QUIET = {
+        'wind': {'light', 'moderate'},
+        'humidity': {'comfortable'}
+    }
+
+    def __init__(self, config=WeatherAppConfig):
+        templates = config.WEATHER_ADVICE
+
+        self.temperature_bounds, self.temperature_labels = compile_thresholds(config.TEMP_THRESHOLDS)
+        self.wind_bounds, self.wind_labels = compile_thresholds(config.WIND_THRESHOLDS)
+        self.humidity_bounds, self.humidity_labels = compile_thresholds(config.HUMIDITY_THRESHOLDS)
+
+        # Condition codes are conditions.Condition values, resolved at parse time
+        self.condition_labels = [ADVICE_KEYS[condition] for condition in Condition]
+
+        self._texts = {
+            'temperature': [templates['temperature'].get(label, '') for label in self.temperature_labels],
+            'condition': [templates['conditions'].get(label, '') if label else ''
+                          for label in self.condition_labels],
+            'wind': ['' if label in self.QUIET['wind'] else templates['wind'].get(label, '')
+                     for label in self.wind_labels],
+            'humidity': ['' if label in self.QUIET['humidity'] else templates['humidity'].get(label, '')
+                         for label in self.humidity_labels]
+        }
+
+    def classify(self, temperature, wind_speed, humidity, condition_codes) -> Dict[str, np.ndarray]:
+        """Advice codes per timestep for each table (condition codes pass through)"""
+        return {
+            'temperature': np.searchsorted(self.temperature_bounds, np.asarray(temperature, dtype=np.float64), side='right'),
+            'wind': np.searchsorted(self.wind_bounds, np.asarray(wind_speed, dtype=np.float64), side='right'),
+            'humidity': np.searchsorted(self.humidity_bounds, np.asarray(humidity, dtype=np.float64), side='right'),
+            'condition': np.asarray(condition_codes, dtype=np.int64)
+        }
+
+    def render(self, codes: Dict[str, np.ndarray]) -> np.ndarray:
+        """Advice text per timestep (object array of str)"""
+        order = ('temperature', 'condition', 'wind', 'humidity')
+        sizes = [len(self._texts[name]) for name in order]
+
+        combined = np.zeros_like(codes['temperature'], dtype=np.int64)
+        for name, size in zip(order, sizes):
+            combined = combined * size + codes[name]
+
+        unique, inverse = np.unique(combined, return_inverse=True)
+        rendered = np.empty(len(unique), dtype=object)
+        for i, value in enumerate(unique.tolist()):
+            parts = []
+            for name, size in zip(reversed(order), reversed(sizes)):
+                value, code = divmod(value, size)
+                parts.append(self._texts[name][code])
+            rendered[i] = ' '.join(part for part in reversed(parts) if part)
+        return rendered[inverse.reshape(-1)]
+
+    def advise(self, temperature, wind_speed, humidity, condition_codes) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Codes and rendered text for arrays of observations"""
+        codes = self.classify(temperature, wind_speed, humidity, condition_codes)
+        return codes, self.render(codes)
+
+    def advise_frame(self, frame) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """Codes and text for every step of a ForecastFrame"""
+        return self.advise(frame.temperature, frame.wind_speed, frame.humidity, frame.condition_codes)
+
+    def advise_one(self, weather_data: Dict) -> str:
+        """Advice text for a single observation dict"""
+        code = weather_data.get('condition_code')
+        if code is None:
+            code = classify_text(weather_data.get('condition', ''))
+        _, texts = self.advise([weather_data['temperature']], [weather_data['wind_speed']],
+                               [weather_data['humidity']], [code])
+        return texts[0]
+
+
+advice_engine = AdviceEngine()
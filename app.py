@@ -6,17 +6,26 @@ Developed by hafizullahkhokhar1
 """
 
 import streamlit as st
-import requests
-import json
 from datetime import datetime, timedelta
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import time
-import geocoder
-import pycountry
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+# plotly and pycountry are imported where they are used, so a cold start
+# does not pay for them until a chart renders or Browse by Country opens
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+from config import WeatherAppConfig
+from cache import response_cache, search_cache, figure_cache, make_location_key, get_ttl
+from key_pool import owm_get
+from geolocation import locate
+from concurrency import fan_out
+from refresh import refresh_scheduler
+from city_index import get_city_index, normalize_name
+from forecast import ForecastFrame
+from advice import advice_engine
+from conditions import classify_weather
+from charts import (bar_trace, chart_template, chart_times, default_options, line_trace,
+                    payload_size)
 
 # Page configuration
 st.set_page_config(
@@ -33,10 +42,9 @@ st.set_page_config(
 
 class WeatherDashboard:
     def __init__(self):
-        # Your OpenWeatherMap API key
-        self.api_key = "a9146620e91727c1ffef05b3acae3607"
-        self.base_url = "https://api.openweathermap.org/data/2.5"
-        self.geocoding_url = "http://api.openweathermap.org/geo/1.0"
+        # API keys come from the shared pool in key_pool.py
+        self.base_url = WeatherAppConfig.OPENWEATHER_BASE_URL
+        self.geocoding_url = WeatherAppConfig.OPENWEATHER_GEO_URL
         
         # Weather icons mapping
         self.weather_icons = {
@@ -56,200 +64,250 @@ class WeatherDashboard:
             st.session_state.last_update = None
         if 'current_location' not in st.session_state:
             st.session_state.current_location = None
+        if 'panels_tick' not in st.session_state:
+            st.session_state.panels_tick = False
 
-    def clear_weather_cache(self):
-        """Clear cached weather data"""
+    def clear_weather_cache(self, lat: Optional[float] = None, lon: Optional[float] = None):
+        """Clear cached weather data, including the shared entries for a location"""
         st.session_state.weather_data = None
         st.session_state.forecast_data = None
         st.session_state.last_update = None
+        if lat is not None and lon is not None:
+            response_cache.invalidate(make_location_key('weather', lat, lon))
+            response_cache.invalidate(make_location_key('forecast', lat, lon))
 
     def get_user_location(self) -> Optional[Dict]:
-        """Get user's current location using IP"""
+        """Get user's current location from their IP (providers raced, cached per IP)"""
         try:
-            # Using ipinfo.io for location detection
-            response = requests.get('https://ipinfo.io/json', timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                loc = data.get('loc', '').split(',')
-                return {
-                    'city': data.get('city', 'Unknown'),
-                    'region': data.get('region', 'Unknown'),
-                    'country': data.get('country', 'Unknown'),
-                    'lat': float(loc[0]) if len(loc) > 0 else 0,
-                    'lon': float(loc[1]) if len(loc) > 1 else 0
-                }
+            location = locate(self._client_ip())
         except Exception as e:
             st.error(f"Location detection failed: {e}")
             return None
+        if location is None:
+            return None
+        return {
+            'city': location['city'],
+            'region': location['region'],
+            'country': location['country'],
+            'lat': location['latitude'],
+            'lon': location['longitude']
+        }
+
+    @staticmethod
+    def _client_ip() -> Optional[str]:
+        """The browser's address, when Streamlit exposes it (1.45+)"""
+        try:
+            return getattr(st.context, 'ip_address', None)
+        except Exception:
+            return None
 
     def get_countries(self) -> List[str]:
         """Get list of countries"""
+        import pycountry
+        
         countries = []
         for country in pycountry.countries:
             countries.append(country.name)
         return sorted(countries)
 
-    def search_cities(self, query: str, limit: int = 5) -> List[Dict]:
-        """Search cities using OpenWeatherMap Geocoding API"""
+    def _fetch_cities(self, query: str, limit: int) -> List[Dict]:
+        """Query the OpenWeatherMap Geocoding API (raises on failure)"""
+        url = f"{self.geocoding_url}/direct"
+        params = {
+            'q': query,
+            'limit': limit
+        }
+        response = owm_get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def get_country_code(self, country_name: str) -> Optional[str]:
+        """Get the ISO 3166 alpha-2 code for a country name"""
+        import pycountry
+        
+        country = pycountry.countries.get(name=country_name)
+        return country.alpha_2 if country else None
+
+    def search_cities(self, query: str, limit: int = 5, country_code: Optional[str] = None) -> List[Dict]:
+        """
+        Search cities in the offline index first, then the OpenWeatherMap
+        Geocoding API for qualified queries and short or typo-only matches
+        Results are cached per normalized query and country, so reruns of
+        the same search do not repeat the lookup
+        """
         try:
-            url = f"{self.geocoding_url}/direct"
-            params = {
-                'q': query,
-                'limit': limit,
-                'appid': self.api_key
-            }
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                return []
+            return search_cache.get_or_load(query, country_code, limit,
+                                            lambda: self._lookup_cities(query, limit, country_code))
         except Exception as e:
+            # Not cached, so the next search asks the geocoder again
+            offline = self._offline_cities(query, limit, country_code)
+            if offline:
+                print(f"Geocoding failed, using offline matches: {e}")
+                return offline
             st.error(f"City search failed: {e}")
             return []
 
-    def get_weather_data(self, lat: float, lon: float) -> Optional[Dict]:
-        """Get current weather data"""
-        try:
-            url = f"{self.base_url}/weather"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.api_key,
-                'units': 'metric'
-            }
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'location': f"{data['name']}, {data['sys']['country']}",
-                    'temperature': round(data['main']['temp']),
-                    'feels_like': round(data['main']['feels_like']),
-                    'humidity': data['main']['humidity'],
-                    'pressure': data['main']['pressure'],
-                    'wind_speed': round(data['wind']['speed'] * 3.6),  # Convert to km/h
-                    'wind_direction': data['wind'].get('deg', 0),
-                    'visibility': data.get('visibility', 0) / 1000,  # Convert to km
-                    'condition': data['weather'][0]['description'].title(),
-                    'icon': data['weather'][0]['icon'],
-                    'sunrise': datetime.fromtimestamp(data['sys']['sunrise']),
-                    'sunset': datetime.fromtimestamp(data['sys']['sunset']),
-                    'timestamp': datetime.now(),
-                    'coordinates': {'lat': lat, 'lon': lon}
-                }
-            else:
-                st.error(f"Weather API Error: {response.status_code}")
-                return None
-        except Exception as e:
-            st.error(f"Error fetching weather data: {e}")
-            return None
+    def _offline_cities(self, query: str, limit: int, country_code: Optional[str]) -> List[Dict]:
+        """Name-prefix matches from the offline index (none for "city, region" queries)"""
+        index = get_city_index()
+        if index is None or ',' in query:
+            return []
+        return index.prefix_search(query, limit, country=country_code)
 
-    def get_forecast_data(self, lat: float, lon: float) -> Optional[Dict]:
-        """Get 5-day weather forecast"""
-        try:
-            url = f"{self.base_url}/forecast"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.api_key,
-                'units': 'metric'
-            }
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                forecasts = []
-                
-                for item in data['list']:
-                    forecasts.append({
-                        'datetime': datetime.fromtimestamp(item['dt']),
-                        'temperature': round(item['main']['temp']),
-                        'feels_like': round(item['main']['feels_like']),
-                        'humidity': item['main']['humidity'],
-                        'condition': item['weather'][0]['description'].title(),
-                        'icon': item['weather'][0]['icon'],
-                        'wind_speed': round(item['wind']['speed'] * 3.6),
-                        'rain': item.get('rain', {}).get('3h', 0)
-                    })
-                
-                return {
-                    'location': f"{data['city']['name']}, {data['city']['country']}",
-                    'forecasts': forecasts,
-                    'coordinates': {'lat': lat, 'lon': lon}
-                }
-            else:
-                st.error(f"Forecast API Error: {response.status_code}")
-                return None
-        except Exception as e:
-            st.error(f"Error fetching forecast data: {e}")
-            return None
+    def _lookup_cities(self, query: str, limit: int, country_code: Optional[str]) -> Tuple[List[Dict], bool]:
+        """
+        Uncached search_cities; returns (cities, answered by the index alone)
+        The offline index answers alone only when it has a full page of
+        name-prefix hits. "City, region" queries go straight to the geocoder
+        (the index cannot tell Paris, TX from Paris, FR), and short pages are
+        topped up from it; typo matches are shown only when it finds nothing.
+        Geocoder errors propagate, so a degraded answer is never cached.
+        """
+        index = get_city_index()
+        qualified = ',' in query
+        local = []
+        if index is not None and not qualified:
+            local = index.prefix_search(query, limit, country=country_code)
+            if len(local) >= limit:
+                return local, True
+
+        remote_query = f"{query},{country_code}" if country_code else query
+        remote = self._fetch_cities(remote_query, limit)
+        cities = self._merge_cities(local, remote, limit)
+        if not cities and index is not None and not qualified:
+            cities = index.search(query, limit, country=country_code)
+        return cities, False
+
+    @staticmethod
+    def _merge_cities(first: List[Dict], second: List[Dict], limit: int) -> List[Dict]:
+        """Concatenate search results, dropping places already listed (same name and country, within ~10 km)"""
+        merged = []
+        for city in first + second:
+            name = normalize_name(city.get('name', ''))
+            if not any(normalize_name(kept.get('name', '')) == name
+                       and kept.get('country') == city.get('country')
+                       and abs(kept.get('lat', 0) - city.get('lat', 0)) < 0.1
+                       and abs(kept.get('lon', 0) - city.get('lon', 0)) < 0.1
+                       for kept in merged):
+                merged.append(city)
+        return merged[:limit]
+
+    def _fetch_weather_data(self, lat: float, lon: float) -> Dict:
+        """Fetch and parse current weather (raises on failure, safe off the script thread)"""
+        url = f"{self.base_url}/weather"
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'units': 'metric'
+        }
+        response = owm_get(url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = response.json()
+        return {
+            'location': f"{data['name']}, {data['sys']['country']}",
+            'temperature': round(data['main']['temp']),
+            'feels_like': round(data['main']['feels_like']),
+            'humidity': data['main']['humidity'],
+            'pressure': data['main']['pressure'],
+            'wind_speed': round(data['wind']['speed'] * 3.6),  # Convert to km/h
+            'wind_direction': data['wind'].get('deg', 0),
+            'visibility': data.get('visibility', 0) / 1000,  # Convert to km
+            'condition': data['weather'][0]['description'].title(),
+            'condition_code': classify_weather(data['weather'][0]),
+            'icon': data['weather'][0]['icon'],
+            'sunrise': datetime.fromtimestamp(data['sys']['sunrise']),
+            'sunset': datetime.fromtimestamp(data['sys']['sunset']),
+            'timestamp': datetime.now(),
+            'coordinates': {'lat': lat, 'lon': lon}
+        }
+
+    def _fetch_forecast_data(self, lat: float, lon: float) -> Dict:
+        """Fetch and parse the 5-day forecast (raises on failure, safe off the script thread)"""
+        url = f"{self.base_url}/forecast"
+        params = {
+            'lat': lat,
+            'lon': lon,
+            'units': 'metric'
+        }
+        response = owm_get(url, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = response.json()
+        return {
+            'location': f"{data['city']['name']}, {data['city']['country']}",
+            'frame': ForecastFrame.from_owm(data['list']),
+            'timestamp': datetime.now(),
+            'coordinates': {'lat': lat, 'lon': lon}
+        }
+
+    def get_cached_weather_data(self, lat: float, lon: float, demand: bool = True) -> Optional[Dict]:
+        """Get current weather through the process-wide cache (raises on upstream failure)"""
+        return self._read_through('weather', lat, lon, lambda: self._fetch_weather_data(lat, lon), demand)
+
+    def get_cached_forecast_data(self, lat: float, lon: float, demand: bool = True) -> Optional[Dict]:
+        """Get forecast through the process-wide cache (raises on upstream failure)"""
+        return self._read_through('forecast', lat, lon, lambda: self._fetch_forecast_data(lat, lon), demand)
+
+    def _read_through(self, endpoint: str, lat: float, lon: float, loader: Callable[[], Dict],
+                      demand: bool = True) -> Optional[Dict]:
+        key = make_location_key(endpoint, lat, lon)
+        ttl = get_ttl(endpoint)
+        if demand and refresh_scheduler is not None:
+            # Locations read often are reloaded in the background before they expire
+            refresh_scheduler.track(key, loader, ttl)
+        return response_cache.get_or_load(key, loader, ttl=ttl)
+
+    def fetch_weather_and_forecast(self, lat: float, lon: float,
+                                   demand: bool = True) -> Tuple[Optional[Dict], Optional[Dict], Dict[str, Exception]]:
+        """
+        Fetch current weather and forecast concurrently
+        Returns whatever finished within FETCH_DEADLINE plus per-call errors
+        """
+        results, errors = fan_out({
+            'weather': lambda: self.get_cached_weather_data(lat, lon, demand),
+            'forecast': lambda: self.get_cached_forecast_data(lat, lon, demand)
+        })
+        return results.get('weather'), results.get('forecast'), errors
+
+    def cached_timestamps(self, lat: float, lon: float) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Timestamps of the live shared entries for a location (None where missing)"""
+        entries = (response_cache.peek(make_location_key(endpoint, lat, lon))
+                   for endpoint in ('weather', 'forecast'))
+        return tuple(entry['timestamp'] if entry else None for entry in entries)
 
     def generate_weather_advice(self, weather_data: Dict) -> str:
         """Generate contextual weather advice"""
-        temp = weather_data['temperature']
-        condition = weather_data['condition'].lower()
-        wind_speed = weather_data['wind_speed']
-        humidity = weather_data['humidity']
-        
-        advice = []
-        
-        # Temperature advice
-        if temp > 35:
-            advice.append("🌡️ Extreme heat! Stay indoors during peak hours, drink lots of water.")
-        elif temp > 30:
-            advice.append("☀️ Very warm - wear light colors, use sunscreen, stay hydrated.")
-        elif temp < 10:
-            advice.append("🧥 Cold weather - dress warmly in layers.")
-        elif temp < 0:
-            advice.append("❄️ Freezing conditions - be careful of icy surfaces.")
-        
-        # Condition advice
-        if 'rain' in condition:
-            advice.append("🌧️ Rainy weather - carry an umbrella, drive carefully.")
-        elif 'thunderstorm' in condition:
-            advice.append("⛈️ Thunderstorm warning - stay indoors, avoid open areas.")
-        elif 'snow' in condition:
-            advice.append("❄️ Snow expected - drive slowly, wear appropriate footwear.")
-        elif 'fog' in condition or 'mist' in condition:
-            advice.append("🌫️ Poor visibility - use headlights, drive with caution.")
-        
-        # Wind advice
-        if wind_speed > 50:
-            advice.append("💨 Very strong winds - avoid outdoor activities, secure objects.")
-        elif wind_speed > 30:
-            advice.append("🌬️ Strong winds - be cautious with umbrellas and light objects.")
-        
-        # Humidity advice
-        if humidity > 80:
-            advice.append("💧 High humidity - expect muggy conditions, stay cool.")
-        elif humidity < 30:
-            advice.append("🏜️ Low humidity - drink water, use moisturizer.")
-        
-        return " ".join(advice) if advice else "Weather conditions are pleasant. Enjoy your day!"
-
-    def create_temperature_chart(self, forecast_data: Dict) -> go.Figure:
-        """Create temperature trend chart"""
-        forecasts = forecast_data['forecasts'][:24]  # Next 24 hours
-        times = [f['datetime'] for f in forecasts]
-        temps = [f['temperature'] for f in forecasts]
-        feels_like = [f['feels_like'] for f in forecasts]
+        return advice_engine.advise_one(weather_data)
+
+    def create_temperature_chart(self, forecast_data: Dict, steps: int = 24) -> "go.Figure":
+        """Create temperature trend chart (shared across sessions until the forecast changes)"""
+        frame = forecast_data['frame']
+        mode, budget = default_options()
+        key = ('temperature_chart', frame.fingerprint(), steps, mode, budget)
+        return figure_cache.get_or_load(key, lambda: self._build_temperature_chart(frame, steps, mode, budget))
+
+    def _build_temperature_chart(self, frame: ForecastFrame, steps: int, mode: str, budget: int) -> "go.Figure":
+        import plotly.graph_objects as go
+        
+        forecasts = frame.head(steps)
+        times = chart_times(forecasts.times, mode)
+        temps = forecasts.temperature
+        feels_like = forecasts.feels_like
         
         fig = go.Figure()
         
         # Temperature line
-        fig.add_trace(go.Scatter(
-            x=times, y=temps,
-            mode='lines+markers',
+        fig.add_trace(line_trace(
+            times, temps, mode, budget,
             name='Temperature',
             line=dict(color='#FF6B6B', width=3),
             marker=dict(size=6)
         ))
         
         # Feels like line
-        fig.add_trace(go.Scatter(
-            x=times, y=feels_like,
-            mode='lines+markers',
+        fig.add_trace(line_trace(
+            times, feels_like, mode, budget,
             name='Feels Like',
             line=dict(color='#4ECDC4', width=2, dash='dot'),
             marker=dict(size=4)
@@ -259,21 +317,30 @@ class WeatherDashboard:
             title="24-Hour Temperature Trend",
             xaxis_title="Time",
             yaxis_title="Temperature (°C)",
-            template="plotly_dark",
+            template=chart_template("plotly_dark", mode, {trace.type for trace in fig.data}),
             height=400,
             showlegend=True,
             hovermode='x unified'
         )
+        fig.update_xaxes(type='date')
         
         return fig
 
-    def create_weather_metrics_chart(self, forecast_data: Dict) -> go.Figure:
-        """Create weather metrics dashboard"""
-        forecasts = forecast_data['forecasts'][:24]
-        times = [f['datetime'] for f in forecasts]
-        humidity = [f['humidity'] for f in forecasts]
-        wind = [f['wind_speed'] for f in forecasts]
-        rain = [f['rain'] for f in forecasts]
+    def create_weather_metrics_chart(self, forecast_data: Dict, steps: int = 24) -> "go.Figure":
+        """Create weather metrics dashboard (shared across sessions until the forecast changes)"""
+        frame = forecast_data['frame']
+        mode, budget = default_options()
+        key = ('metrics_chart', frame.fingerprint(), steps, mode, budget)
+        return figure_cache.get_or_load(key, lambda: self._build_weather_metrics_chart(frame, steps, mode, budget))
+
+    def _build_weather_metrics_chart(self, frame: ForecastFrame, steps: int, mode: str, budget: int) -> "go.Figure":
+        from plotly.subplots import make_subplots
+        
+        forecasts = frame.head(steps)
+        times = chart_times(forecasts.times, mode)
+        humidity = forecasts.humidity
+        wind = forecasts.wind_speed
+        rain = forecasts.rain
         
         # Create subplots
         fig = make_subplots(
@@ -283,36 +350,34 @@ class WeatherDashboard:
         )
         
         # Humidity
-        fig.add_trace(go.Scatter(
-            x=times, y=humidity,
-            mode='lines+markers',
+        fig.add_trace(line_trace(
+            times, humidity, mode, budget,
             name='Humidity',
             line=dict(color='#45B7D1', width=2),
             marker=dict(size=4)
         ), row=1, col=1)
         
         # Wind Speed
-        fig.add_trace(go.Scatter(
-            x=times, y=wind,
-            mode='lines+markers',
+        fig.add_trace(line_trace(
+            times, wind, mode, budget,
             name='Wind Speed',
             line=dict(color='#96CEB4', width=2),
             marker=dict(size=4)
         ), row=2, col=1)
         
-        # Rainfall
-        fig.add_trace(go.Bar(
-            x=times, y=rain,
-            name='Rainfall',
-            marker=dict(color='#FECA57')
+        # Rainfall, colored by condition
+        fig.add_trace(bar_trace(
+            times, rain, forecasts.condition_codes, mode, budget,
+            name='Rainfall'
         ), row=3, col=1)
         
         fig.update_layout(
             height=600,
-            template="plotly_dark",
+            template=chart_template("plotly_dark", mode, {trace.type for trace in fig.data}),
             showlegend=False,
             title_text="Weather Metrics - Next 24 Hours"
         )
+        fig.update_xaxes(type='date')
         
         return fig
 
@@ -352,45 +417,154 @@ class WeatherDashboard:
         """Display forecast data"""
         st.markdown("### 📅 5-Day Forecast")
         
-        # Group forecast by days
-        daily_forecasts = {}
-        for forecast in forecast_data['forecasts']:
-            date_key = forecast['datetime'].date()
-            if date_key not in daily_forecasts:
-                daily_forecasts[date_key] = []
-            daily_forecasts[date_key].append(forecast)
+        frame = forecast_data['frame']
+        daily = frame.daily()
         
         # Display first 5 days
         cols = st.columns(5)
-        for i, (date, day_forecasts) in enumerate(list(daily_forecasts.items())[:5]):
-            if i < len(cols):
-                with cols[i]:
-                    # Get representative forecast (noon or closest)
-                    noon_forecast = None
-                    for forecast in day_forecasts:
-                        if forecast['datetime'].hour >= 12:
-                            noon_forecast = forecast
-                            break
-                    if not noon_forecast:
-                        noon_forecast = day_forecasts[0]
-                    
-                    # Calculate daily stats
-                    temps = [f['temperature'] for f in day_forecasts]
-                    max_temp = max(temps)
-                    min_temp = min(temps)
-                    
-                    icon = self.weather_icons.get(noon_forecast['icon'], '🌤️')
-                    day_name = date.strftime("%A")[:3]
-                    
-                    st.markdown(f"""
-                    <div style="text-align: center; background: rgba(255, 255, 255, 0.1); 
-                                padding: 1rem; border-radius: 10px; backdrop-filter: blur(10px);">
-                        <h4 style="margin: 0; color: #333;">{day_name}</h4>
-                        <div style="font-size: 2rem; margin: 0.5rem 0;">{icon}</div>
-                        <p style="margin: 0; font-weight: bold;">{max_temp}° / {min_temp}°</p>
-                        <p style="margin: 0.5rem 0; font-size: 0.8rem;">{noon_forecast['condition']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+        for i, day in enumerate(daily['date'][:5]):
+            with cols[i]:
+                # Representative forecast (noon or closest) and daily stats
+                noon = daily['rep'][i]
+                max_temp = daily['max'][i]
+                min_temp = daily['min'][i]
+                
+                icon = self.weather_icons.get(frame.icons[noon], '🌤️')
+                day_name = day.item().strftime("%A")[:3]
+                
+                st.markdown(f"""
+                <div style="text-align: center; background: rgba(255, 255, 255, 0.1); 
+                            padding: 1rem; border-radius: 10px; backdrop-filter: blur(10px);">
+                    <h4 style="margin: 0; color: #333;">{day_name}</h4>
+                    <div style="font-size: 2rem; margin: 0.5rem 0;">{icon}</div>
+                    <p style="margin: 0; font-weight: bold;">{max_temp}° / {min_temp}°</p>
+                    <p style="margin: 0.5rem 0; font-size: 0.8rem;">{frame.conditions[noon]}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+    def render_live_weather_panels(self, lat: float, lon: float):
+        """Fragment body for auto-refresh: rebuild only when the shared cache has newer data"""
+        # Full script runs reset the flag, so it is only still set on a timer tick
+        tick, st.session_state.panels_tick = st.session_state.panels_tick, True
+        if not tick:
+            self.render_weather_panels(lat, lon)
+            return
+        
+        rendered = tuple(data['timestamp'] if data else None
+                         for data in (st.session_state.weather_data, st.session_state.forecast_data))
+        cached = self.cached_timestamps(lat, lon)
+        if None not in cached and cached == rendered:
+            # Nothing newer: redraw what this session already has
+            self.draw_weather_panels(st.session_state.weather_data, st.session_state.forecast_data)
+            return
+        
+        # Ticks are not demand, so an idle dashboard doesn't keep its location
+        # hot in the refresh scheduler
+        self.render_weather_panels(lat, lon, demand=False)
+
+    def render_weather_panels(self, lat: float, lon: float, demand: bool = True):
+        """Current weather, advice, charts and forecast for one location"""
+        # Weather and forecast are fetched concurrently through the shared
+        # cache; only a miss goes upstream
+        with st.spinner("🔄 Fetching real-time weather data..."):
+            weather_data, forecast_data, errors = self.fetch_weather_and_forecast(lat, lon, demand)
+        
+        for name, error in errors.items():
+            st.error(f"Error fetching {name} data: {error}")
+        
+        if not weather_data and not forecast_data:
+            st.error("❌ Failed to fetch weather data. Please try again.")
+            return
+        
+        last_update = (weather_data or forecast_data)['timestamp']
+        if st.session_state.last_update != last_update:
+            st.success("✅ Weather data updated successfully!")
+        st.session_state.weather_data = weather_data
+        st.session_state.forecast_data = forecast_data
+        st.session_state.last_update = last_update
+        
+        self.draw_weather_panels(weather_data, forecast_data)
+
+    def draw_weather_panels(self, weather_data: Optional[Dict], forecast_data: Optional[Dict]):
+        """Lay out the panels for data already fetched"""
+        # Past the revalidation window means upstream has been failing and the
+        # last good value is standing in
+        for name, data in (('weather', weather_data), ('forecast', forecast_data)):
+            if data:
+                age = (datetime.now() - data['timestamp']).total_seconds()
+                if age > get_ttl(name) + WeatherAppConfig.CACHE_STALE_WHILE_REVALIDATE:
+                    st.warning(f"⚠️ OpenWeatherMap is not responding - showing {name} data "
+                               f"from {age / 60:.0f} minutes ago.")
+        
+        # Display weather data (partial results are shown as they are)
+        if weather_data:
+            # Current Weather Section
+            st.markdown("## 🌡️ Current Weather")
+            self.display_current_weather(weather_data)
+        
+            # Weather Advice Section
+            st.markdown("## 💡 Weather Advice")
+            advice = self.generate_weather_advice(weather_data)
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%); 
+                        padding: 1.5rem; border-radius: 15px; margin: 1rem 0;">
+                <h4 style="color: #333; margin-top: 0;">🎯 Smart Recommendations</h4>
+                <p style="color: #333; font-size: 1.1rem; margin-bottom: 0;">{advice}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.warning("⚠️ Current conditions are unavailable right now - showing the forecast only.")
+        
+        if forecast_data:
+            # Charts Section
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                st.markdown("## 📈 Temperature Trends")
+                temp_chart = self.create_temperature_chart(forecast_data)
+                st.plotly_chart(temp_chart, use_container_width=True)
+                if WeatherAppConfig.CHART_PAYLOAD_REPORT:
+                    st.caption(f"Chart payload: {payload_size(temp_chart) / 1024:.1f} KB")
+        
+            with col2:
+                st.markdown("## 📊 Weather Metrics")
+                metrics_chart = self.create_weather_metrics_chart(forecast_data)
+                st.plotly_chart(metrics_chart, use_container_width=True)
+                if WeatherAppConfig.CHART_PAYLOAD_REPORT:
+                    st.caption(f"Chart payload: {payload_size(metrics_chart) / 1024:.1f} KB")
+        
+            # Forecast Section
+            self.display_forecast(forecast_data)
+        
+            # Tomorrow's Weather Section
+            st.markdown("## 🌅 Tomorrow's Weather")
+            tomorrow = forecast_data['frame'].day_summary(datetime.now().date() + timedelta(days=1))
+        
+            if tomorrow:
+                noon_forecast = tomorrow['rep']
+                max_temp, min_temp = tomorrow['max'], tomorrow['min']
+                icon = self.weather_icons.get(noon_forecast['icon'], '🌤️')
+            
+                st.markdown(f"""
+                <div style="background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%); 
+                            padding: 2rem; border-radius: 15px; text-align: center;">
+                    <h2 style="color: #333; margin: 0;">{icon} Tomorrow</h2>
+                    <h1 style="color: #333; margin: 0.5rem 0;">{max_temp}° / {min_temp}°</h1>
+                    <h3 style="color: #333; margin: 0;">{noon_forecast['condition']}</h3>
+                    <p style="color: #333; margin: 0.5rem 0;">Wind: {noon_forecast['wind_speed']} km/h | Humidity: {noon_forecast['humidity']}%</p>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.warning("⚠️ The forecast is unavailable right now - showing current conditions only.")
+        
+        # Last updated info
+        st.markdown("---")
+        st.markdown(f"""
+        <div style="text-align: center; opacity: 0.7;">
+            <small>Last updated: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')} | 
+            Data provided by OpenWeatherMap | Developed by hafizullahkhokhar1</small>
+        </div>
+        """, unsafe_allow_html=True)
 
     def run_dashboard(self):
         """Main dashboard interface"""
@@ -464,8 +638,7 @@ class WeatherDashboard:
                 if selected_country:
                     city_query = st.text_input(f"🏙️ Enter city in {selected_country}:")
                     if city_query:
-                        search_query = f"{city_query}, {selected_country}"
-                        cities = self.search_cities(search_query)
+                        cities = self.search_cities(city_query, country_code=self.get_country_code(selected_country))
                         if cities:
                             city_options = [f"{city['name']}, {city.get('state', '')}" for city in cities]
                             selected_city = st.selectbox("Select city:", city_options, key="country_city_select")
@@ -483,121 +656,24 @@ class WeatherDashboard:
             
             # Auto-refresh toggle
             st.markdown("---")
-            auto_refresh = st.checkbox("🔄 Auto-refresh (30s)", value=False)
-            if auto_refresh:
-                # Use a placeholder to implement auto-refresh
-                placeholder = st.empty()
-                with placeholder:
-                    time.sleep(1)
-                    st.rerun()
+            auto_refresh = st.checkbox(f"🔄 Auto-refresh ({WeatherAppConfig.AUTO_REFRESH_INTERVAL}s)", value=False)
             
             # Manual refresh button
             if st.button("🔄 Refresh Weather Data"):
-                self.clear_weather_cache()
+                self.clear_weather_cache(lat, lon)
                 st.rerun()
         
         # Main content
         if lat and lon:
-            # Fetch weather data
-            if (st.session_state.weather_data is None or 
-                st.session_state.last_update is None or 
-                (datetime.now() - st.session_state.last_update).seconds > 300):  # Refresh every 5 minutes
-                
-                with st.spinner("🔄 Fetching real-time weather data..."):
-                    weather_data = self.get_weather_data(lat, lon)
-                    forecast_data = self.get_forecast_data(lat, lon)
-                    
-                    if weather_data and forecast_data:
-                        st.session_state.weather_data = weather_data
-                        st.session_state.forecast_data = forecast_data
-                        st.session_state.last_update = datetime.now()
-                        st.success("✅ Weather data updated successfully!")
-                    else:
-                        st.error("❌ Failed to fetch weather data. Please try again.")
-                        return
-            
-            # Display weather data
-            if st.session_state.weather_data and st.session_state.forecast_data:
-                weather_data = st.session_state.weather_data
-                forecast_data = st.session_state.forecast_data
-                
-                # Verify we have data for the correct location
-                if (weather_data.get('coordinates', {}).get('lat') != lat or 
-                    weather_data.get('coordinates', {}).get('lon') != lon):
-                    # Location changed, force refresh
-                    self.clear_weather_cache()
-                    st.rerun()
-                    return
-                
-                # Current Weather Section
-                st.markdown("## 🌡️ Current Weather")
-                self.display_current_weather(weather_data)
-                
-                # Weather Advice Section
-                st.markdown("## 💡 Weather Advice")
-                advice = self.generate_weather_advice(weather_data)
-                st.markdown(f"""
-                <div style="background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%); 
-                            padding: 1.5rem; border-radius: 15px; margin: 1rem 0;">
-                    <h4 style="color: #333; margin-top: 0;">🎯 Smart Recommendations</h4>
-                    <p style="color: #333; font-size: 1.1rem; margin-bottom: 0;">{advice}</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Charts Section
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.markdown("## 📈 Temperature Trends")
-                    temp_chart = self.create_temperature_chart(forecast_data)
-                    st.plotly_chart(temp_chart, use_container_width=True)
-                
-                with col2:
-                    st.markdown("## 📊 Weather Metrics")
-                    metrics_chart = self.create_weather_metrics_chart(forecast_data)
-                    st.plotly_chart(metrics_chart, use_container_width=True)
-                
-                # Forecast Section
-                self.display_forecast(forecast_data)
-                
-                # Tomorrow's Weather Section
-                st.markdown("## 🌅 Tomorrow's Weather")
-                tomorrow_forecasts = [f for f in forecast_data['forecasts'] 
-                                    if f['datetime'].date() == (datetime.now().date() + timedelta(days=1))]
-                
-                if tomorrow_forecasts:
-                    # Find noon forecast for tomorrow
-                    noon_forecast = None
-                    for forecast in tomorrow_forecasts:
-                        if forecast['datetime'].hour >= 12:
-                            noon_forecast = forecast
-                            break
-                    if not noon_forecast:
-                        noon_forecast = tomorrow_forecasts[0]
-                    
-                    temps = [f['temperature'] for f in tomorrow_forecasts]
-                    max_temp, min_temp = max(temps), min(temps)
-                    icon = self.weather_icons.get(noon_forecast['icon'], '🌤️')
-                    
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #a8edea 0%, #fed6e3 100%); 
-                                padding: 2rem; border-radius: 15px; text-align: center;">
-                        <h2 style="color: #333; margin: 0;">{icon} Tomorrow</h2>
-                        <h1 style="color: #333; margin: 0.5rem 0;">{max_temp}° / {min_temp}°</h1>
-                        <h3 style="color: #333; margin: 0;">{noon_forecast['condition']}</h3>
-                        <p style="color: #333; margin: 0.5rem 0;">Wind: {noon_forecast['wind_speed']} km/h | Humidity: {noon_forecast['humidity']}%</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                # Last updated info
-                st.markdown("---")
-                st.markdown(f"""
-                <div style="text-align: center; opacity: 0.7;">
-                    <small>Last updated: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')} | 
-                    Data provided by OpenWeatherMap | Developed by hafizullahkhokhar1</small>
-                </div>
-                """, unsafe_allow_html=True)
-        
+            if auto_refresh:
+                # Only the data panels rerun on the timer, and they rebuild only
+                # when the shared cache holds something newer than what is shown
+                st.session_state.panels_tick = False
+                st.fragment(self.render_live_weather_panels,
+                            run_every=WeatherAppConfig.AUTO_REFRESH_INTERVAL)(lat, lon)
+            else:
+                self.render_weather_panels(lat, lon)
+
         else:
             # Welcome screen
             st.markdown("""
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Async Weather API Module
+asyncio counterpart of weather.WeatherAPI for embedding in async services
+
+Uses aiohttp when it is installed; otherwise requests are run on the shared
+worker pool through the pooled transport so the module works without it.
+
+Developed by hafizullahkhokhar1
+"""
+
+import asyncio
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import requests
+
+from config import WeatherAppConfig
+from concurrency import get_executor
+from cache import response_cache, get_ttl
+from circuit_breaker import endpoint_name, get_breaker
+from geolocation import locate
+from key_pool import owm_get_async
+from transport import http_get
+from weather import WeatherAPI, Location
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncWeatherAPI:
+    """
+    Async weather client with the same surface as WeatherAPI
+    Results have the same dict shapes as the sync client
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        # Parsing, key rotation and demo data are shared with the sync client
+        self.sync_api = WeatherAPI()
+
+        self.max_concurrency = max_concurrency or WeatherAppConfig.ASYNC_MAX_CONCURRENCY
+        self.timeout = timeout or WeatherAppConfig.API_TIMEOUT
+
+        # Created lazily so they bind to the loop that first uses them
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncWeatherAPI":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying aiohttp session, if any"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                             limit_per_host=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                        timeout: Optional[float] = None) -> Tuple[int, Optional[Any], Mapping[str, str]]:
+        """
+        GET a JSON document under the concurrency limit
+        Goes through the endpoint's process-wide circuit breaker, like
+        transport.http_get. Returns (status_code, parsed body or None,
+        headers); raises asyncio.TimeoutError when the per-call timeout expires
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        async with self._get_semaphore():
+            if aiohttp is not None:
+                return await get_breaker(endpoint_name(url)).call_async(
+                    lambda: asyncio.wait_for(self._get_json_aiohttp(url, params), timeout),
+                    is_failure=lambda result: result[0] >= 500,
+                    transport_errors=(aiohttp.ClientError, asyncio.TimeoutError)
+                )
+
+            # http_get applies the breaker itself
+            loop = asyncio.get_running_loop()
+            response = await asyncio.wait_for(
+                loop.run_in_executor(get_executor(), lambda: http_get(url, params=params, timeout=timeout)),
+                timeout
+            )
+            body = response.json() if response.status_code == 200 else None
+            return response.status_code, body, response.headers
+
+    async def _get_json_aiohttp(self, url: str,
+                                params: Optional[Dict[str, Any]]) -> Tuple[int, Optional[Any], Mapping[str, str]]:
+        async with self._get_session().get(url, params=params) as response:
+            if response.status != 200:
+                return response.status, None, response.headers
+            return response.status, await response.json(content_type=None), response.headers
+
+    async def _get_owm_json(self, url: str, params: Dict[str, Any],
+                            timeout: Optional[float] = None) -> Tuple[int, Optional[Any]]:
+        """_get_json with a key from the shared pool; a 401/429 is retried on the other keys"""
+        return await owm_get_async(lambda url, params: self._get_json(url, params, timeout),
+                                   url, params, pool=self.sync_api.key_pool)
+
+    async def _get_weather_from_api(self, city: Location, timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Async WeatherAPI._get_weather_from_api: None for an unknown city, raises on other failures"""
+        params = {
+            **self.sync_api._location_params(city),
+            'units': 'metric'
+        }
+        status, data = await self._get_owm_json(f"{self.sync_api.weather_base_url}/weather", params, timeout)
+        if status == 404:
+            print(f"City '{city}' not found")
+            return None
+        if status != 200:
+            raise requests.exceptions.HTTPError(f"API error: {status}")
+        return self.sync_api._parse_weather_response(data)
+
+    async def _get_forecast_from_api(self, city: Location, days: int,
+                                     timeout: Optional[float]) -> Optional[Dict[str, Any]]:
+        """Async WeatherAPI._get_forecast_from_api: None for an unknown city, raises on other failures"""
+        params = {
+            **self.sync_api._location_params(city),
+            'units': 'metric',
+            'cnt': days * 8  # 8 forecasts per day (every 3 hours)
+        }
+        status, data = await self._get_owm_json(f"{self.sync_api.weather_base_url}/forecast", params, timeout)
+        if status == 404:
+            return None
+        if status != 200:
+            raise requests.exceptions.HTTPError(f"Forecast API error: {status}")
+        return self.sync_api._parse_forecast_response(data)
+
+    async def get_weather(self, city: Location, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get weather data for a city
+        Shares WeatherAPI's cache entries and in-flight lookups, and fails
+        like WeatherAPI.get_weather: a stale value within the cache's
+        stale-if-error grace period, then demo data
+        """
+        try:
+            result = await response_cache.get_or_load_async(self.sync_api._weather_key(city),
+                                                            lambda: self._get_weather_from_api(city, timeout),
+                                                            ttl=get_ttl('weather'))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"API call failed: {e}")
+            result = self.sync_api._get_demo_weather_data(city)
+        return result.copy() if result else result
+
+    async def get_forecast(self, city: Location, days: int = 5,
+                           timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Get weather forecast for a city"""
+        try:
+            result = await response_cache.get_or_load_async(self.sync_api._forecast_key(city, days),
+                                                            lambda: self._get_forecast_from_api(city, days, timeout),
+                                                            ttl=get_ttl('forecast'))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Forecast API failed: {e}")
+            result = self.sync_api._get_demo_forecast(city, days)
+        if result:
+            result = {**result, 'forecasts': [f.copy() for f in result['forecasts']]}
+        return result
+
+    async def search_cities(self, query: str, limit: int = 5) -> list:
+        """Search for cities matching the query"""
+        return self.sync_api.search_cities(query, limit)
+
+    async def get_current_location(self, ip: Optional[str] = None,
+                                   timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get current location using IP geolocation
+        Same lookup as WeatherAPI.get_current_location (offline database,
+        provider race, per-IP cache), run on a thread since it blocks; the
+        default location is returned if it fails or timeout expires
+        """
+        try:
+            # Not the shared pool: locate() waits on provider calls queued there
+            lookup = asyncio.to_thread(locate, ip)
+            location = await (asyncio.wait_for(lookup, timeout) if timeout is not None else lookup)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            print(f"Location lookup timed out after {timeout}s")
+            location = None
+        except Exception as e:
+            print(f"Location API failed: {e}")
+            location = None
+        return location or self.sync_api._get_default_location()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark Module
+Times the CPU hot paths that run on every fetch or rerun (response
+parsing, forecast building, day grouping, advice, categories and chart
+building) on synthetic forecasts of 40 to 10,000 points
+
+    python benchmarks.py --json before.json
+    python benchmarks.py --json after.json --compare before.json
+    python benchmarks.py --sizes 40,1000 --cases parse_forecast,daily
+
+Results are per-call times (median and best of --repeat runs) written
+as JSON with the commit they were measured at.
+
+Developed by hafizullahkhokhar1
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from mock_owm import forecast_items, weather_payload
+
+
+DEFAULT_SIZES = [40, 400, 2000, 10000]
+
+
+def forecast_fixture(n: int, seed: int = 0) -> Dict[str, Any]:
+    """An OpenWeatherMap forecast response with n 3-hourly points"""
+    start = int(time.time()) // 10800 * 10800
+    return {
+        'cod': '200',
+        'cnt': n,
+        'list': forecast_items(random.Random(seed), start, n),
+        'city': {'name': 'Karachi', 'country': 'PK', 'coord': {'lat': 24.86, 'lon': 67.0}}
+    }
+
+
+def weather_fixture() -> Dict[str, Any]:
+    """An OpenWeatherMap current weather response"""
+    return weather_payload({'q': 'Karachi,PK'})
+
+
+def build_cases() -> Dict[str, Callable[[int], Callable[[], Any]]]:
+    """
+    Case name -> setup(n) returning the function to time
+    Setup work (fixtures, warm caches) is not timed. Cases that do not
+    depend on the forecast size ignore n and are run once per size.
+    """
+    from config import WeatherAppConfig
+    from weather import WeatherAPI
+    from forecast import ForecastFrame
+    from advice import advice_engine
+    from charts import default_options
+    from app import WeatherDashboard
+
+    api = WeatherAPI()
+    dashboard = WeatherDashboard.__new__(WeatherDashboard)  # no session state needed
+
+    def frame_for(n: int) -> ForecastFrame:
+        return ForecastFrame.from_owm(forecast_fixture(n)['list'])
+
+    def parse_weather(n):
+        data = weather_fixture()
+        return lambda: api._parse_weather_response(data)
+
+    def parse_forecast(n):
+        data = forecast_fixture(n)
+        return lambda: api._parse_forecast_response(data)
+
+    def forecast_frame(n):
+        items = forecast_fixture(n)['list']
+        return lambda: ForecastFrame.from_owm(items)
+
+    def daily(n):
+        frame = frame_for(n)
+
+        def run():
+            frame._memo.pop('daily', None)
+            return frame.daily()
+        return run
+
+    def advice(n):
+        data = api._parse_weather_response(weather_fixture())
+        data['wind_speed'] = 25
+        return lambda: dashboard.generate_weather_advice(data)
+
+    def advice_frame(n):
+        frame = frame_for(n)
+        return lambda: advice_engine.advise_frame(frame)
+
+    def categories(n):
+        frame = frame_for(n)
+        rows = list(zip(frame.temperature.tolist(), frame.wind_speed.tolist(), frame.humidity.tolist()))
+
+        def run():
+            for temperature, wind_speed, humidity in rows:
+                WeatherAppConfig.get_temperature_category(temperature)
+                WeatherAppConfig.get_wind_category(wind_speed)
+                WeatherAppConfig.get_humidity_category(humidity)
+        return run
+
+    def chart_build(builder_name):
+        def setup(n):
+            frame = frame_for(n)
+            mode, budget = default_options()
+            builder = getattr(dashboard, builder_name)
+            return lambda: builder(frame, n, mode, budget)
+        return setup
+
+    def chart_cached(method_name):
+        def setup(n):
+            forecast_data = {'frame': frame_for(n)}
+            method = getattr(dashboard, method_name)
+            method(forecast_data, steps=n)  # warm the figure cache
+            return lambda: method(forecast_data, steps=n)
+        return setup
+
+    return {
+        'parse_weather': parse_weather,
+        'parse_forecast': parse_forecast,
+        'forecast_frame': forecast_frame,
+        'daily': daily,
+        'advice': advice,
+        'advice_frame': advice_frame,
+        'categories': categories,
+        'temperature_chart': chart_build('_build_temperature_chart'),
+        'metrics_chart': chart_build('_build_weather_metrics_chart'),
+        'temperature_chart_cached': chart_cached('create_temperature_chart'),
+        'metrics_chart_cached': chart_cached('create_weather_metrics_chart')
+    }
+
+
+SIZE_INDEPENDENT = {'parse_weather', 'advice'}
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """Per-call seconds: loops sized so one run takes at least min_time"""
+    timer = timeit.Timer(fn)
+    loops = 1
+    while True:
+        if timer.timeit(loops) >= min_time:
+            break
+        loops *= 2 if loops < 1000 else 10
+    runs = sorted(timer.repeat(repeat=repeat, number=loops))
+    return {
+        'median_us': round(runs[len(runs) // 2] / loops * 1e6, 3),
+        'best_us': round(runs[0] / loops * 1e6, 3),
+        'loops': loops,
+        'repeat': repeat
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Commit and library versions, so runs can be matched to a tree"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    versions = {}
+    for name in ('numpy', 'plotly', 'streamlit'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'versions': versions
+    }
+
+
+def run(sizes: List[int], case_names: Optional[List[str]], repeat: int, min_time: float) -> List[Dict[str, Any]]:
+    cases = build_cases()
+    results = []
+    for name, setup in cases.items():
+        if case_names and name not in case_names:
+            continue
+        for n in ([sizes[0]] if name in SIZE_INDEPENDENT else sizes):
+            result = {'case': name, 'n': n, **measure(setup(n), repeat, min_time)}
+            results.append(result)
+            print(f"   {name:26} n={n:<6} {result['median_us']:>12.1f} us")
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any]):
+    """Print new/old median ratios against a previous report"""
+    old = {(r['case'], r['n']): r['median_us'] for r in baseline['results']}
+    print(f"\n📊 Compared with {baseline.get('environment', {}).get('commit') or 'baseline'} "
+          f"(ratio < 1 is faster)")
+    for result in results:
+        before = old.get((result['case'], result['n']))
+        if before:
+            ratio = result['median_us'] / before
+            print(f"   {result['case']:26} n={result['n']:<6} {before:>12.1f} -> "
+                  f"{result['median_us']:>12.1f} us  x{ratio:.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the CPU hot paths")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated forecast lengths")
+    parser.add_argument('--cases', help="comma-separated case names (default: all)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timed run")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--compare', help="previous JSON report to compare with")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    case_names = args.cases.split(',') if args.cases else None
+
+    print(f"⏱️ Hot-path micro-benchmarks (sizes {sizes})")
+    report = {'environment': environment(), 'sizes': sizes,
+              'results': run(sizes, case_names, args.repeat, args.min_time)}
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report['results'], json.load(f))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Results written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Shared Response Cache Module
+Process-wide TTL cache shared by every Streamlit session and WeatherAPI instance
+
+Developed by hafizullahkhokhar1
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from config import WeatherAppConfig
+from concurrency import SingleFlight, get_executor
+from persistent_cache import PersistentCache
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a per-entry TTL
+    Expired entries are kept for a grace period: get_or_load serves them
+    while revalidating in the background (stale_while_revalidate seconds
+    past expiry) or when the loader fails (stale_if_error seconds)
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = 300, name: str = "cache",
+                 backing: Optional[PersistentCache] = None,
+                 stale_while_revalidate: float = 0, stale_if_error: float = 0):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.name = name
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self._grace = max(stale_while_revalidate, stale_if_error)
+
+        # Optional on-disk tier consulted on a miss before calling the loader
+        self.backing = backing
+
+        # key -> (expires_at, value), oldest access first
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Concurrent misses for the same key share one loader call
+        self.flights = SingleFlight(name)
+        # Background revalidations started by get_or_load_async
+        self._tasks: Set["asyncio.Task"] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_served = 0
+        self.stale_on_error = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value, or default on miss/expiry"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            now = time.monotonic()
+            if expires_at <= now:
+                if expires_at + self._grace <= now:
+                    del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting least recently used entries when full"""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key: Hashable) -> Any:
+        """Return a fresh cached value without touching LRU order or counters"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            return entry[1]
+
+    def get_stale(self, key: Hashable) -> Tuple[Any, float]:
+        """
+        Return (value, seconds_since_expiry) for an expired entry still in its
+        grace period, or (None, 0)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None, 0
+            expired_for = time.monotonic() - entry[0]
+            if expired_for <= 0 or expired_for >= self._grace:
+                return None, 0
+            return entry[1], expired_for
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Read-through lookup
+        Calls loader on a miss and caches the result unless it is None.
+        Concurrent misses for one key are coalesced into a single loader call.
+        A recently expired value is returned at once while it is reloaded in
+        the background, and an older one stands in if the loader raises.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return self._load_missing(key, loader, ttl)
+
+    def _load_missing(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        """get_or_load after get() has missed (so the miss is counted once)"""
+        stale, expired_for = self.get_stale(key)
+        if stale is not None and expired_for < self.stale_while_revalidate:
+            self.stale_served += 1
+            self._revalidate(key, loader, ttl)
+            return stale
+
+        try:
+            return self.flights.do(key, lambda: self._load(key, loader, ttl))
+        except Exception as e:
+            if stale is not None and expired_for < self.stale_if_error:
+                self.stale_on_error += 1
+                print(f"Serving stale {self.name} entry ({expired_for:.0f}s past expiry): {e}")
+                return stale
+            raise
+
+    def _revalidate(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]):
+        """Reload key on the shared pool unless a load for it is already running"""
+        if self.flights.in_flight(key):
+            return
+
+        def run():
+            try:
+                self.refresh(key, loader, ttl)
+            except Exception as e:
+                print(f"Background revalidation of {self.name} entry failed: {e}")
+
+        get_executor().submit(run)
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]],
+                                ttl: Optional[float] = None) -> Any:
+        """
+        get_or_load for coroutine loaders
+        Shares single-flight slots with get_or_load, so sync and async
+        callers missing on one key make one upstream call between them
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        stale, expired_for = self.get_stale(key)
+        if stale is not None and expired_for < self.stale_while_revalidate:
+            self.stale_served += 1
+            self._revalidate_async(key, loader, ttl)
+            return stale
+
+        async def load():
+            value = self._cached(key)
+            if value is not None:
+                return value
+            return self._store(key, await loader(), ttl)
+
+        try:
+            return await self.flights.do_async(key, load)
+        except Exception as e:
+            if stale is not None and expired_for < self.stale_if_error:
+                self.stale_on_error += 1
+                print(f"Serving stale {self.name} entry ({expired_for:.0f}s past expiry): {e}")
+                return stale
+            raise
+
+    def _revalidate_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]):
+        """Reload key in a task on the running loop unless a load for it is already running"""
+        if self.flights.in_flight(key):
+            return
+
+        async def run():
+            try:
+                await self.flights.do_async(key, lambda: self._store_async(key, loader, ttl))
+            except Exception as e:
+                print(f"Background revalidation of {self.name} entry failed: {e}")
+
+        # The loop only keeps weak references to tasks
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _store_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        return self._store(key, await loader(), ttl)
+
+    def _cached(self, key: Hashable) -> Any:
+        """Value from memory or the backing tier, without calling a loader"""
+        # A flight that finished just before this one started may have filled the entry
+        value = self.peek(key)
+        if value is not None:
+            return value
+
+        if self.backing is not None:
+            value, remaining = self.backing.get(key)
+            if value is not None:
+                self.set(key, value, remaining)
+                return value
+        return None
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        value = self._cached(key)
+        if value is not None:
+            return value
+        return self._store(key, loader(), ttl)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> Any:
+        if value is not None:
+            self.set(key, value, ttl)
+            if self.backing is not None:
+                self.backing.put(key, value, self.default_ttl if ttl is None else ttl)
+        return value
+
+    def refresh(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Reload an entry even if it is still fresh
+        Shares the single-flight slot with get_or_load, so a user miss for the
+        same key waits for this load instead of starting another
+        """
+        return self.flights.do(key, lambda: self._store(key, loader(), ttl))
+
+    def expires_in(self, key: Hashable) -> Optional[float]:
+        """Seconds until an entry expires (None if missing or already expired)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            remaining = entry[0] - time.monotonic()
+            return remaining if remaining > 0 else None
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+        if self.backing is not None:
+            self.backing.delete(key)
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'coalesced': self.flights.coalesced,
+                'stale_served': self.stale_served,
+                'stale_on_error': self.stale_on_error,
+                'disk_hits': self.backing.hits if self.backing is not None else 0
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key) is not None
+
+
+class SearchCache:
+    """
+    TTL cache for city search results keyed by normalized query and country
+    A longer query is answered by filtering a cached shorter prefix when that
+    shorter result came from the offline prefix index alone and was not
+    truncated at the limit. Geocoder results match whole names, not
+    prefixes, so answers that include them are never reused this way.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600,
+                 backing: Optional[PersistentCache] = None):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, default_ttl=ttl, name="search", backing=backing)
+        self.prefix_hits = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return ' '.join(query.lower().split())
+
+    def _from_prefix(self, query: str, country: Optional[str], limit: int) -> Optional[List[Dict]]:
+        if ',' in query:
+            return None  # "city, region" queries are not plain name prefixes
+        for end in range(len(query) - 1, 0, -1):
+            entry = self._cache.peek(('search', query[:end], country, limit))
+            if entry is None:
+                continue
+            results, complete = entry
+            if not complete:
+                return None  # the shorter answer may have dropped matches
+            matches = [city for city in results if self.normalize(city.get('name', '')).startswith(query)]
+            # Nothing left may just mean a typo the full search would still match
+            return matches or None
+        return None
+
+    def get_or_load(self, query: str, country: Optional[str], limit: int,
+                    loader: Callable[[], Tuple[List[Dict], bool]]) -> List[Dict]:
+        """
+        Return cached results for a query, reusing a cached prefix when possible
+        loader returns (results, local_only), local_only being True when
+        every result came from a name-prefix search of the offline index
+        """
+        query = self.normalize(query)
+        key = ('search', query, country, limit)
+
+        entry = self._cache.get(key)
+        if entry is None:
+            results = self._from_prefix(query, country, limit)
+            if results is not None:
+                self.prefix_hits += 1
+                entry = (results, True)
+                self._cache.set(key, entry)
+        if entry is None:
+            entry = self._cache._load_missing(key, lambda: self._wrap(*loader(), limit), None)
+        return entry[0]
+
+    @staticmethod
+    def _wrap(results: List[Dict], local_only: bool, limit: int) -> Tuple[List[Dict], bool]:
+        return results, local_only and len(results) < limit
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, including answers served from a prefix"""
+        stats = self._cache.stats()
+        stats['prefix_hits'] = self.prefix_hits
+        return stats
+
+    def clear(self):
+        self._cache.clear()
+
+
+def make_location_key(endpoint: str, lat: float, lon: float, units: str = 'metric') -> Tuple:
+    """
+    Build a cache key from coordinates
+    Coordinates are rounded so that the same city picked from different
+    searches (or auto-detect) shares one entry
+    """
+    precision = WeatherAppConfig.CACHE_COORD_PRECISION
+    return (endpoint, round(float(lat), precision), round(float(lon), precision), units)
+
+
+def get_ttl(endpoint: str) -> float:
+    """Get the configured TTL for an endpoint"""
+    return WeatherAppConfig.CACHE_TTLS.get(endpoint, WeatherAppConfig.CACHE_TTLS['default'])
+
+
+def _build_backing() -> Optional[PersistentCache]:
+    """Open the on-disk tier if PERSISTENT_CACHE_PATH is configured"""
+    path = WeatherAppConfig.PERSISTENT_CACHE_PATH
+    if not path:
+        return None
+    try:
+        return PersistentCache(path,
+                               max_entries=WeatherAppConfig.PERSISTENT_CACHE_MAX_ENTRIES,
+                               compact_interval=WeatherAppConfig.PERSISTENT_CACHE_COMPACT_INTERVAL,
+                               schema_version=WeatherAppConfig.CACHE_SCHEMA_VERSION)
+    except Exception as e:
+        print(f"Persistent cache disabled: {e}")
+        return None
+
+
+# Process-wide instance shared by all sessions. It lives in its own module
+# because Streamlit re-executes app.py on every rerun.
+response_cache = TTLCache(maxsize=WeatherAppConfig.CACHE_MAX_ENTRIES,
+                          default_ttl=WeatherAppConfig.CACHE_TTLS['default'],
+                          name="responses",
+                          backing=_build_backing(),
+                          stale_while_revalidate=WeatherAppConfig.CACHE_STALE_WHILE_REVALIDATE,
+                          stale_if_error=WeatherAppConfig.CACHE_STALE_IF_ERROR)
+
+search_cache = SearchCache(maxsize=WeatherAppConfig.SEARCH_CACHE_MAX_ENTRIES,
+                           ttl=WeatherAppConfig.CACHE_TTLS['geocode'],
+                           backing=response_cache.backing)
+
+# Built chart figures keyed by forecast fingerprint and chart options, shared
+# by every session. Memory only: these are live Plotly objects, not plain data.
+figure_cache = TTLCache(maxsize=WeatherAppConfig.FIGURE_CACHE_MAX_ENTRIES,
+                        default_ttl=get_ttl('forecast'),
+                        name="figures")
+
+# IP geolocation results keyed by client IP. Memory only, so client
+# addresses are never written to disk.
+location_cache = TTLCache(maxsize=WeatherAppConfig.LOCATION_CACHE_MAX_ENTRIES,
+                          default_ttl=get_ttl('location'),
+                          name="locations")
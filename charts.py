@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Chart Payload Module
+Helpers that keep the Plotly specs sent to the browser small: numeric
+timestamp arrays, WebGL line traces, LTTB downsampling and a trimmed
+template, plus a per-chart payload size report
+
+plotly is imported inside the functions that need it (see app.py).
+
+Developed by hafizullahkhokhar1
+"""
+
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+
+from config import WeatherAppConfig
+from conditions import COLOR_ARRAY
+
+_templates: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+
+
+def is_compact(mode: str) -> bool:
+    return mode == 'compact'
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices kept by Largest-Triangle-Three-Buckets downsampling
+    The first and last points are always kept; every series of at most
+    threshold points (or a threshold below 3) is returned whole
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        x_avg = x[next_start:next_end].mean()
+        y_avg = y[next_start:next_end].mean()
+
+        area = np.abs((x[a] - x_avg) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (y_avg - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def chart_times(times: np.ndarray, mode: str) -> np.ndarray:
+    """x values for a date axis: epoch milliseconds in compact mode, datetime64 otherwise"""
+    if is_compact(mode):
+        # Naive local times read as UTC, so the axis shows the same wall clock
+        return times.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    return times
+
+
+def line_trace(x: np.ndarray, y: np.ndarray, mode: str, budget: int, **kwargs):
+    """Scatter trace (Scattergl and downsampled in compact mode)"""
+    import plotly.graph_objects as go
+
+    if not is_compact(mode):
+        return go.Scatter(x=x, y=y, mode='lines+markers', **kwargs)
+
+    kwargs.pop('marker', None)
+    keep = lttb_indices(x, y, budget)
+    return go.Scattergl(x=x[keep], y=y[keep], mode='lines', **kwargs)
+
+
+def chart_template(name: str, mode: str, trace_types: Iterable[str]):
+    """Template for a chart; compact mode keeps only the trace types in use"""
+    if not is_compact(mode):
+        return name
+
+    key = (name, tuple(sorted(trace_types)))
+    if key not in _templates:
+        import plotly.graph_objects as go
+        import plotly.io as pio
+
+        base = pio.templates[name]
+        _templates[key] = go.layout.Template(
+            layout=base.layout,
+            data={trace_type: getattr(base.data, trace_type) for trace_type in key[1]}
+        )
+    return _templates[key]
+
+
+def payload_size(fig) -> int:
+    """
+    JSON payload of a figure in bytes
+    Measured once and kept on the figure itself: built figures are shared
+    by every session through figure_cache, so each session reads the size
+    of the figure it actually rendered
+    """
+    size = getattr(fig, '_payload_size', None)
+    if size is None:
+        import plotly.io as pio
+        size = fig._payload_size = len(pio.to_json(fig, validate=False).encode('utf-8'))
+    return size
+
+
+def condition_marker(condition_codes: np.ndarray, mode: str) -> Dict[str, Any]:
+    """Marker colors per step from conditions.COLORS"""
+    if not is_compact(mode):
+        return dict(color=COLOR_ARRAY[condition_codes])
+
+    # Codes go out as a small integer array mapped through a discrete colorscale
+    top = len(COLOR_ARRAY) - 1
+    return dict(color=condition_codes, cmin=0, cmax=top,
+                colorscale=[[code / top, color] for code, color in enumerate(COLOR_ARRAY)])
+
+
+def bar_trace(x: np.ndarray, y: np.ndarray, condition_codes: np.ndarray, mode: str, budget: int, **kwargs):
+    """Bar trace colored by condition (downsampled in compact mode)"""
+    import plotly.graph_objects as go
+
+    if is_compact(mode):
+        keep = lttb_indices(x, y, budget)
+        x, y, condition_codes = x[keep], y[keep], condition_codes[keep]
+    return go.Bar(x=x, y=y, marker=condition_marker(condition_codes, mode), **kwargs)
+
+
+def default_options() -> Tuple[str, int]:
+    """(mode, point budget) from WeatherAppConfig"""
+    return WeatherAppConfig.CHART_PAYLOAD_MODE, WeatherAppConfig.CHART_POINT_BUDGET
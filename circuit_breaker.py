@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker Module
+Process-wide breakers per upstream endpoint, so once a dependency is
+failing, calls fail immediately (to the cache or fallback path) instead of
+every session waiting out its own timeout
+
+Developed by hafizullahkhokhar1
+"""
+
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+import requests
+
+from config import WeatherAppConfig
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker
+    Closed: calls go through; failure_threshold consecutive failures open it.
+    Open: calls are rejected until reset_timeout has passed.
+    Half-open: up to half_open_probes calls go through; one success closes
+    the breaker, a failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30,
+                 half_open_probes: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.trips = 0
+
+    def _before_call(self) -> bool:
+        """Admit or reject a call; returns True if it is a half-open probe"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit for {self.name} is open")
+                self.state = self.HALF_OPEN
+                self._probes = 0
+
+            if self.state == self.HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit for {self.name} is half-open (probe in flight)")
+                self._probes += 1
+                return True
+            return False
+
+    def _after_call(self, probe: bool, failed: Optional[bool]):
+        """Record an outcome; failed=None only gives back the probe slot"""
+        with self._lock:
+            if probe:
+                self._probes -= 1
+            if failed is None:
+                return
+            if not failed:
+                self._failures = 0
+                self.state = self.CLOSED
+                return
+
+            self._failures += 1
+            if probe or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable[[], Any], is_failure: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Run fn through the breaker
+        Network errors count as failures, as do results for which
+        is_failure returns True (e.g. 5xx responses, which are still returned)
+        """
+        probe = self._before_call()
+        failed: Optional[bool] = True
+        try:
+            result = fn()
+            failed = is_failure is not None and is_failure(result)
+            return result
+        except requests.exceptions.RequestException:
+            raise
+        except BaseException:
+            # Not the endpoint's fault: leave the state and counters alone
+            failed = None
+            raise
+        finally:
+            self._after_call(probe, failed)
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]],
+                         is_failure: Optional[Callable[[Any], bool]] = None,
+                         transport_errors: Tuple[Type[BaseException], ...] = (
+                             requests.exceptions.RequestException,)) -> Any:
+        """
+        call() for coroutines
+        transport_errors are the exceptions that count as endpoint failures
+        (e.g. aiohttp.ClientError and asyncio.TimeoutError for aiohttp calls)
+        """
+        probe = self._before_call()
+        failed: Optional[bool] = True
+        try:
+            result = await fn()
+            failed = is_failure is not None and is_failure(result)
+            return result
+        except transport_errors:
+            raise
+        except BaseException:
+            failed = None
+            raise
+        finally:
+            self._after_call(probe, failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state and counters"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'state': self.state,
+                'consecutive_failures': self._failures,
+                'trips': self.trips,
+                'rejected': self.rejected
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def endpoint_name(url: str) -> str:
+    """Breaker name for a URL: host plus path, without the query"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get the process-wide breaker for an endpoint, creating it on first use"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(
+                    name,
+                    failure_threshold=WeatherAppConfig.BREAKER_FAILURE_THRESHOLD,
+                    reset_timeout=WeatherAppConfig.BREAKER_RESET_TIMEOUT,
+                    half_open_probes=WeatherAppConfig.BREAKER_HALF_OPEN_PROBES
+                )
+    return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker created so far"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Offline City Index Module
+Local autocomplete over a GeoNames-style city list, so city search does
+not need a network round trip
+
+Accepts the bundled data/cities.tsv (name, country, admin1, lat, lon,
+population) or a raw GeoNames cities*.txt dump.
+
+Developed by hafizullahkhokhar1
+"""
+
+import bisect
+import heapq
+import threading
+import unicodedata
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from config import WeatherAppConfig
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    ascii_text = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(ascii_text.lower().split())
+
+
+def trigrams(text: str) -> set:
+    """Padded character trigrams of a normalized name"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CityIndex:
+    """
+    In-memory city index with prefix and typo-tolerant trigram search
+    Columns are stored in flat arrays; the name column is sorted so prefix
+    lookups are two binary searches
+    """
+
+    def __init__(self, rows: List[tuple]):
+        # Sort once by normalized name so prefix ranges are contiguous
+        rows = sorted(rows, key=lambda row: (row[0], -row[6]))
+
+        self.keys: List[str] = [row[0] for row in rows]
+        self.names: List[str] = [row[1] for row in rows]
+        self.countries: List[str] = [row[2] for row in rows]
+        self.admin1: List[str] = [row[3] for row in rows]
+        self.lats = array('d', (row[4] for row in rows))
+        self.lons = array('d', (row[5] for row in rows))
+        self.populations = array('q', (row[6] for row in rows))
+
+        postings = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            for gram in trigrams(key):
+                postings[gram].append(i)
+        self._postings: Dict[str, array] = {gram: array('I', ids) for gram, ids in postings.items()}
+        self._gram_counts = array('H', (len(trigrams(key)) for key in self.keys))
+
+    @classmethod
+    def load(cls, path: str) -> "CityIndex":
+        """Load a bundled TSV or a GeoNames dump"""
+        rows = []
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                fields = line.rstrip('\n').split('\t')
+                try:
+                    if len(fields) >= 15:
+                        # GeoNames: name=1, lat=4, lon=5, country=8, admin1 code=10, population=14
+                        name, country, admin1 = fields[1], fields[8], fields[10]
+                        lat, lon, population = fields[4], fields[5], fields[14]
+                    else:
+                        name, country, admin1, lat, lon, population = fields[:6]
+                    rows.append((normalize_name(name), name, country, admin1,
+                                 float(lat), float(lon), int(population or 0)))
+                except ValueError:
+                    continue
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _record(self, i: int) -> Dict:
+        """Result in the same shape as the OpenWeatherMap geocoding API"""
+        record = {
+            'name': self.names[i],
+            'country': self.countries[i],
+            'lat': self.lats[i],
+            'lon': self.lons[i],
+            'population': self.populations[i]
+        }
+        if self.admin1[i]:
+            record['state'] = self.admin1[i]
+        return record
+
+    def prefix_ids(self, key: str) -> range:
+        """Ids whose normalized name starts with key"""
+        lo = bisect.bisect_left(self.keys, key)
+        hi = bisect.bisect_left(self.keys, key + '\uffff', lo)
+        return range(lo, hi)
+
+    def fuzzy_ids(self, key: str, min_score: float) -> Dict[int, float]:
+        """Ids whose trigram similarity (Jaccard) to key is at least min_score"""
+        grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for i in self._postings.get(gram, ()):
+                shared[i] += 1
+
+        scores = {}
+        for i, count in shared.items():
+            score = count / (len(grams) + self._gram_counts[i] - count)
+            if score >= min_score:
+                scores[i] = score
+        return scores
+
+    def _prefix_hits(self, key: str, limit: int, country: Optional[str]) -> List[int]:
+        prefix = [i for i in self.prefix_ids(key) if country is None or self.countries[i] == country]
+        return heapq.nlargest(limit, prefix, key=lambda i: self.populations[i])
+
+    def prefix_search(self, query: str, limit: int = 5, country: Optional[str] = None) -> List[Dict]:
+        """Cities whose name starts with the query, ranked by population (no typo matches)"""
+        key = normalize_name(query)
+        if not key:
+            return []
+        return [self._record(i) for i in self._prefix_hits(key, limit, country)]
+
+    def search(self, query: str, limit: int = 5, country: Optional[str] = None) -> List[Dict]:
+        """
+        Search by name prefix, then fill with typo-tolerant matches
+        Each group is ranked by population; country filters by ISO code
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        def allowed(i: int) -> bool:
+            return country is None or self.countries[i] == country
+
+        results = self._prefix_hits(key, limit, country)
+        prefix = self.prefix_ids(key)  # range: O(1) membership
+
+        if len(results) < limit and len(key) >= 3:
+            fuzzy = self.fuzzy_ids(key, WeatherAppConfig.CITY_INDEX_MIN_SIMILARITY)
+            candidates = [i for i in fuzzy if i not in prefix and allowed(i)]
+            results += heapq.nlargest(limit - len(results), candidates,
+                                      key=lambda i: (fuzzy[i], self.populations[i]))
+
+        return [self._record(i) for i in results]
+
+
+def country_name(code: str) -> str:
+    """Full country name for an ISO code (the code itself if pycountry is missing)"""
+    try:
+        import pycountry
+    except ImportError:
+        return code
+    country = pycountry.countries.get(alpha_2=code)
+    if country is None:
+        return code
+    return getattr(country, 'common_name', None) or country.name
+
+
+_index: Optional[CityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_city_index() -> Optional[CityIndex]:
+    """Get the process-wide index, loading it on first use (None if unavailable)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = CityIndex.load(WeatherAppConfig.CITY_INDEX_PATH)
+                except OSError as e:
+                    print(f"City index unavailable: {e}")
+                    return None
+    return _index
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Concurrency Helpers Module
+Shared worker pool for fanning out independent upstream calls,
+single-flight coalescing of identical in-flight lookups and a token
+bucket for rate budgets
+
+Developed by hafizullahkhokhar1
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from config import WeatherAppConfig
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide worker pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=WeatherAppConfig.FETCH_WORKERS,
+                    thread_name_prefix="weather-fetch"
+                )
+    return _executor
+
+
+def fan_out(calls: Dict[str, Callable[[], Any]],
+            deadline: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    Run independent calls concurrently under one combined deadline
+    Returns (results, errors) keyed like calls; a call that raised or
+    did not finish before the deadline appears in errors only
+    """
+    if deadline is None:
+        deadline = WeatherAppConfig.FETCH_DEADLINE
+
+    executor = get_executor()
+    futures = {name: executor.submit(call) for name, call in calls.items()}
+    wait(futures.values(), timeout=deadline)
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            errors[name] = TimeoutError(f"{name} did not finish within {deadline}s")
+            continue
+
+        error = future.exception()
+        if error is not None:
+            errors[name] = error
+        else:
+            results[name] = future.result()
+
+    return results, errors
+
+
+class _Call:
+    """One in-flight call that followers (threads or coroutines) wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._lock = threading.Lock()
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def finish(self):
+        """Wake every follower"""
+        with self._lock:
+            self.event.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # that loop has been closed
+
+    async def wait_async(self):
+        """Wait without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if self.event.is_set():
+                return
+            self._waiters.append((loop, future))
+        await future
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():  # the waiting coroutine may have been cancelled
+        future.set_result(None)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and share its result or exception
+    """
+
+    def __init__(self, name: str = "flights"):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[_Call, bool]:
+        """The call for key and whether this caller leads it"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.executions += 1
+            return call, True
+
+    def _leave(self, key: Hashable, call: _Call):
+        with self._lock:
+            del self._calls[key]
+        call.finish()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the identical call already in flight"""
+        call, leader = self._join(key)
+        if not leader:
+            call.event.wait()
+            return call.outcome()
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._leave(key, call)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        do() for coroutines
+        Flights are shared with do(), so a thread and a coroutine asking for
+        the same key make one call between them
+        """
+        call, leader = self._join(key)
+        if not leader:
+            await call.wait_async()
+            return call.outcome()
+
+        try:
+            call.result = await fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._leave(key, call)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is currently running"""
+        with self._lock:
+            return key in self._calls
+
+    def stats(self) -> Dict[str, Any]:
+        """Return execution/coalescing counters"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'coalesced': self.coalesced
+            }
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    Holds up to capacity tokens and refills at rate tokens per second
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available; never blocks"""
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def available(self) -> float:
+        """Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Weather Condition Classifier Module
+Maps OpenWeatherMap condition ids (or free-text descriptions) to one
+compact Condition code, resolved once at parse time and shared by icons,
+advice and chart colors
+
+Developed by hafizullahkhokhar1
+"""
+
+import re
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from config import WeatherAppConfig
+
+
+class Condition(IntEnum):
+    """Weather condition family"""
+    UNKNOWN = 0
+    CLEAR = 1
+    PARTLY_CLOUDY = 2
+    CLOUDY = 3
+    DRIZZLE = 4
+    RAIN = 5
+    THUNDERSTORM = 6
+    SNOW = 7
+    SLEET = 8
+    FOG = 9
+    DUST = 10
+    SQUALL = 11
+    TORNADO = 12
+
+
+# OWM condition id ranges (https://openweathermap.org/weather-conditions)
+_ID_RANGES = [
+    (200, 300, Condition.THUNDERSTORM),
+    (300, 400, Condition.DRIZZLE),
+    (500, 600, Condition.RAIN),
+    (600, 700, Condition.SNOW),
+    (611, 617, Condition.SLEET),
+    (701, 702, Condition.FOG),
+    (711, 712, Condition.DUST),   # smoke
+    (721, 722, Condition.FOG),    # haze
+    (731, 732, Condition.DUST),   # sand/dust whirls
+    (741, 742, Condition.FOG),
+    (751, 763, Condition.DUST),   # sand, dust, volcanic ash
+    (771, 772, Condition.SQUALL),
+    (781, 782, Condition.TORNADO),
+    (800, 801, Condition.CLEAR),
+    (801, 803, Condition.PARTLY_CLOUDY),
+    (803, 805, Condition.CLOUDY)
+]
+
+# Direct lookup table indexed by condition id; later ranges override earlier ones
+ID_TABLE = np.zeros(1000, dtype=np.int8)
+for _start, _stop, _condition in _ID_RANGES:
+    ID_TABLE[_start:_stop] = _condition
+
+# Description fallback, in priority order (first pattern present anywhere wins)
+_TEXT_PATTERNS = [
+    (Condition.TORNADO, r'tornado|hurricane'),
+    (Condition.THUNDERSTORM, r'thunder|storm'),
+    (Condition.SLEET, r'sleet|freezing'),
+    (Condition.SNOW, r'snow'),
+    (Condition.DRIZZLE, r'drizzle'),
+    (Condition.RAIN, r'rain|shower'),
+    (Condition.SQUALL, r'squall|wind'),
+    (Condition.DUST, r'dust|sand|smoke|ash'),
+    (Condition.FOG, r'fog|mist|haze'),
+    (Condition.PARTLY_CLOUDY, r'partly|few clouds|scattered clouds'),
+    (Condition.CLOUDY, r'cloud|overcast'),
+    (Condition.CLEAR, r'clear|sunny')
+]
+
+# Each alternative is a lookahead over the whole string, so alternation
+# order (not match position) decides priority
+_TEXT_REGEX = re.compile(
+    '^(?:' + '|'.join(f'(?=.*?(?P<{condition.name}>{pattern}))'
+                      for condition, pattern in _TEXT_PATTERNS) + ')',
+    re.IGNORECASE | re.DOTALL
+)
+
+ICONS = {
+    Condition.UNKNOWN: '🌤️',
+    Condition.CLEAR: WeatherAppConfig.WEATHER_ICONS['clear'],
+    Condition.PARTLY_CLOUDY: WeatherAppConfig.WEATHER_ICONS['partly_cloudy'],
+    Condition.CLOUDY: WeatherAppConfig.WEATHER_ICONS['cloudy'],
+    Condition.DRIZZLE: WeatherAppConfig.WEATHER_ICONS['drizzle'],
+    Condition.RAIN: WeatherAppConfig.WEATHER_ICONS['rain'],
+    Condition.THUNDERSTORM: WeatherAppConfig.WEATHER_ICONS['thunderstorm'],
+    Condition.SNOW: WeatherAppConfig.WEATHER_ICONS['snow'],
+    Condition.SLEET: WeatherAppConfig.WEATHER_ICONS['sleet'],
+    Condition.FOG: WeatherAppConfig.WEATHER_ICONS['fog'],
+    Condition.DUST: WeatherAppConfig.WEATHER_ICONS['dust'],
+    Condition.SQUALL: WeatherAppConfig.WEATHER_ICONS['windy'],
+    Condition.TORNADO: WeatherAppConfig.WEATHER_ICONS['tornado']
+}
+
+# Key into WeatherAppConfig.WEATHER_ADVICE['conditions'] (None: no advice)
+ADVICE_KEYS = {
+    Condition.UNKNOWN: None,
+    Condition.CLEAR: 'clear',
+    Condition.PARTLY_CLOUDY: 'cloudy',
+    Condition.CLOUDY: 'cloudy',
+    Condition.DRIZZLE: 'drizzle',
+    Condition.RAIN: 'rain',
+    Condition.THUNDERSTORM: 'thunderstorm',
+    Condition.SNOW: 'snow',
+    Condition.SLEET: 'snow',
+    Condition.FOG: 'fog',
+    Condition.DUST: 'fog',
+    Condition.SQUALL: 'windy',
+    Condition.TORNADO: 'thunderstorm'
+}
+
+# Chart colors, e.g. for rainfall bars
+COLORS = {
+    Condition.UNKNOWN: '#FECA57',
+    Condition.CLEAR: '#FECA57',
+    Condition.PARTLY_CLOUDY: '#FECA57',
+    Condition.CLOUDY: '#B0BEC5',
+    Condition.DRIZZLE: '#81D4FA',
+    Condition.RAIN: '#45B7D1',
+    Condition.THUNDERSTORM: '#9B59B6',
+    Condition.SNOW: '#FFFFFF',
+    Condition.SLEET: '#CFD8DC',
+    Condition.FOG: '#95A5A6',
+    Condition.DUST: '#D4A373',
+    Condition.SQUALL: '#96CEB4',
+    Condition.TORNADO: '#E74C3C'
+}
+
+# Same tables as arrays indexed by code, for whole forecasts at once
+ICON_ARRAY = np.array([ICONS[condition] for condition in Condition], dtype=object)
+COLOR_ARRAY = np.array([COLORS[condition] for condition in Condition], dtype=object)
+
+
+def classify_id(condition_id: Optional[int]) -> Condition:
+    """Condition for an OWM condition id (UNKNOWN if missing or out of range)"""
+    if condition_id is None or not 0 <= condition_id < len(ID_TABLE):
+        return Condition.UNKNOWN
+    return Condition(int(ID_TABLE[condition_id]))
+
+
+@lru_cache(maxsize=1024)
+def classify_text(description: str) -> Condition:
+    """Condition for a free-text description such as 'Light Rain'"""
+    match = _TEXT_REGEX.match(description)
+    return Condition[match.lastgroup] if match else Condition.UNKNOWN
+
+
+def classify_weather(weather: Dict) -> Condition:
+    """Condition for one entry of an OWM 'weather' list (id first, then description)"""
+    condition = classify_id(weather.get('id'))
+    if condition is Condition.UNKNOWN:
+        condition = classify_text(weather.get('description', ''))
+    return condition
+
+
+def condition_icon(condition: int) -> str:
+    """Emoji for a condition code"""
+    return ICONS[Condition(condition)]
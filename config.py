@@ -55,11 +55,12 @@ class WeatherAppConfig:
     }
     
     # API Configuration
+    # Only real keys belong here: every key in the pool takes live traffic.
+    # WEATHER_OWM_KEYS (comma-separated) replaces the list.
     OPENWEATHER_API_KEYS = [
-        "bd5e378503939ddaee76f12ad7a97608",  # Demo key 1
-        "2a0b95b4a5b5b4a5b5b4a5b5b4a5b5b4",  # Demo key 2
-        "5f2b88c4f2b88c4f2b88c4f2b88c4f2b",  # Demo key 3
-        "a9146620e91727c1ffef05b3acae3607"       # User replacement
+        key.strip() for key in
+        os.environ.get('WEATHER_OWM_KEYS', "a9146620e91727c1ffef05b3acae3607").split(',')
+        if key.strip()
     ]
     
     IPINFO_API_KEYS = [
@@ -67,15 +68,86 @@ class WeatherAppConfig:
         "your_ipinfo_token_here"  # User replacement
     ]
     
-    # API Endpoints
-    OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
+    # Per-key limits for the OpenWeatherMap key pool
+    OPENWEATHER_CALLS_PER_MINUTE = int(os.environ.get('WEATHER_OWM_CALLS_PER_MINUTE', 60))  # plan limit for each key
+    API_KEY_BACKOFF_BASE = 60          # first pause after a 429 (seconds), doubling after that
+    API_KEY_BACKOFF_MAX = 3600         # longest pause; a 401 disables a key for this long
+    
+    # API Endpoints (point WEATHER_OWM_URL at mock_owm.py for load tests)
+    OPENWEATHER_ROOT_URL = os.environ.get('WEATHER_OWM_URL', "https://api.openweathermap.org").rstrip('/')
+    OPENWEATHER_BASE_URL = f"{OPENWEATHER_ROOT_URL}/data/2.5"
+    OPENWEATHER_GEO_URL = f"{OPENWEATHER_ROOT_URL}/geo/1.0"
     IPINFO_BASE_URL = "https://ipinfo.io"
+    IPAPI_BASE_URL = "https://ipapi.co"
+    IPWHOIS_BASE_URL = "https://ipwho.is"
+    # IP geolocation providers raced against each other; the first usable answer wins
+    GEOLOCATION_PROVIDERS = ['ipinfo', 'ipapi', 'ipwhois']
     
     # Request Settings
     API_TIMEOUT = 10  # seconds
     LOCATION_TIMEOUT = 5  # seconds
     MAX_RETRIES = 3
-    
+    HTTP_POOL_CONNECTIONS = 10  # distinct hosts kept alive
+    HTTP_POOL_MAXSIZE = 32      # connections per host
+    FETCH_WORKERS = 16          # shared pool for concurrent upstream calls
+    FETCH_DEADLINE = 12         # seconds for a combined weather+forecast fetch
+    ASYNC_MAX_CONCURRENCY = 100 # in-flight requests per AsyncWeatherAPI
+    BATCH_WORKERS = 16          # default pool size for get_*_many batches
+    BREAKER_FAILURE_THRESHOLD = 5   # consecutive failures that open an endpoint's breaker
+    BREAKER_RESET_TIMEOUT = 30      # seconds open before probing again
+    BREAKER_HALF_OPEN_PROBES = 1    # concurrent probe requests while half-open
+
+    # Shared Cache Settings
+    CACHE_MAX_ENTRIES = 2048
+    SEARCH_CACHE_MAX_ENTRIES = 4096
+    LOCATION_CACHE_MAX_ENTRIES = 4096  # client IPs with a known location
+    FIGURE_CACHE_MAX_ENTRIES = 256  # built Plotly figures, keyed by forecast content
+    CACHE_COORD_PRECISION = 3  # decimal places (~100 m)
+    CACHE_TTLS = {
+        'weather': 300,     # current conditions (seconds)
+        'forecast': 1800,   # 3-hourly forecast
+        'geocode': 86400,   # city search results
+        'location': 21600,  # IP geolocation, per client IP
+        'default': 300
+    }
+    CACHE_STALE_WHILE_REVALIDATE = 120  # seconds past expiry served at once while reloading
+    CACHE_STALE_IF_ERROR = 3600         # seconds past expiry served when OpenWeatherMap fails
+
+    # Chart Payload Settings
+    CHART_PAYLOAD_MODE = os.environ.get('WEATHER_CHART_MODE', 'compact')  # 'compact' or 'standard'
+    CHART_POINT_BUDGET = 500  # max points per series before LTTB downsampling
+    CHART_PAYLOAD_REPORT = os.environ.get('WEATHER_CHART_REPORT') == '1'  # caption payload size under charts
+
+    # Dashboard auto-refresh (seconds between partial reruns of the data panels)
+    AUTO_REFRESH_INTERVAL = 30
+
+    # Refresh-ahead for frequently viewed locations
+    REFRESH_AHEAD_ENABLED = os.environ.get('WEATHER_REFRESH_AHEAD', '1') == '1'
+    REFRESH_AHEAD_SECONDS = 30      # reload this long before an entry expires
+    REFRESH_JITTER = 0.5            # lead time varies by up to this fraction per entry
+    REFRESH_CHECK_INTERVAL = 5      # seconds between scheduler passes
+    REFRESH_CONCURRENCY = 4         # refreshes in flight at once
+    REFRESH_QUOTA_PER_MINUTE = 30   # upstream calls the scheduler may spend
+    REFRESH_MIN_SCORE = 3.0         # decayed access count that makes a location "hot"
+    REFRESH_HALF_LIFE = 600         # seconds for an access to count half as much
+    REFRESH_MAX_TRACKED = 1024      # locations tracked; the coldest are dropped first
+
+    # Optional on-disk cache tier (set WEATHER_CACHE_DB to a file path to enable)
+    PERSISTENT_CACHE_PATH = os.environ.get('WEATHER_CACHE_DB')
+    PERSISTENT_CACHE_MAX_ENTRIES = 20000
+    PERSISTENT_CACHE_COMPACT_INTERVAL = 600  # seconds
+    CACHE_SCHEMA_VERSION = 3  # bump when cached value layouts change
+
+    # Offline City Search
+    CITY_INDEX_PATH = os.environ.get(
+        'WEATHER_CITY_INDEX',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cities.tsv')
+    )
+    CITY_INDEX_MIN_SIMILARITY = 0.4  # trigram Jaccard score for typo matches
+
+    # Offline IP geolocation (build with ip_database.py, then set WEATHER_IP_DB to the file)
+    IP_DATABASE_PATH = os.environ.get('WEATHER_IP_DB')
+
     # Animation Settings
     ANIMATION_SPEED = {
         'rain': 100,      # milliseconds between frames
@@ -337,19 +409,8 @@ class WeatherAppConfig:
     @classmethod
     def get_weather_icon(cls, condition: str) -> str:
         """Get weather icon based on condition"""
-        condition_lower = condition.lower()
-        
-        # Check for exact matches first
-        if condition_lower in cls.WEATHER_ICONS:
-            return cls.WEATHER_ICONS[condition_lower]
-        
-        # Check for partial matches
-        for key, icon in cls.WEATHER_ICONS.items():
-            if key in condition_lower:
-                return icon
-        
-        # Default icon
-        return '🌤️'
+        from conditions import classify_text, condition_icon  # conditions imports this module
+        return condition_icon(classify_text(condition))
     
     @classmethod
     def create_directories(cls):
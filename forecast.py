@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Columnar Forecast Module
+Forecast steps stored as NumPy columns, with daily aggregation done in
+vectorized form and memoized on the frame
+
+Developed by hafizullahkhokhar1
+"""
+
+import hashlib
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from conditions import classify_weather
+
+
+class ForecastFrame:
+    """
+    Forecast time series as parallel NumPy arrays
+    Rows are in time order; times are naive local datetimes, like
+    datetime.fromtimestamp
+    """
+
+    NUMERIC_COLUMNS = ('temperature', 'feels_like', 'humidity', 'wind_speed', 'rain')
+
+    def __init__(self, times: np.ndarray, columns: Dict[str, np.ndarray],
+                 conditions: np.ndarray, icons: np.ndarray, condition_codes: np.ndarray):
+        self.times = times
+        self.temperature = columns['temperature']
+        self.feels_like = columns['feels_like']
+        self.humidity = columns['humidity']
+        self.wind_speed = columns['wind_speed']
+        self.rain = columns['rain']
+        self.conditions = conditions
+        self.icons = icons
+        self.condition_codes = condition_codes  # conditions.Condition values
+
+        self._memo: Dict[Any, Any] = {}
+
+    @classmethod
+    def from_owm(cls, items: List[Dict]) -> "ForecastFrame":
+        """Build a frame from the 'list' of an OpenWeatherMap forecast response"""
+        n = len(items)
+        timestamps = np.fromiter((item['dt'] for item in items), dtype=np.int64, count=n)
+        # Local wall-clock time, as datetime.fromtimestamp would give
+        times = np.array([datetime.fromtimestamp(ts) for ts in timestamps.tolist()],
+                         dtype='datetime64[s]')
+
+        columns = {
+            'temperature': np.rint([item['main']['temp'] for item in items]).astype(np.int16),
+            'feels_like': np.rint([item['main']['feels_like'] for item in items]).astype(np.int16),
+            'humidity': np.array([item['main']['humidity'] for item in items], dtype=np.int16),
+            'wind_speed': np.rint([item['wind']['speed'] * 3.6 for item in items]).astype(np.int16),
+            'rain': np.array([item.get('rain', {}).get('3h', 0) for item in items], dtype=np.float32)
+        }
+        conditions = np.array([item['weather'][0]['description'].title() for item in items], dtype=object)
+        icons = np.array([item['weather'][0]['icon'] for item in items], dtype=object)
+        condition_codes = np.fromiter((classify_weather(item['weather'][0]) for item in items),
+                                      dtype=np.int8, count=n)
+        return cls(times, columns, conditions, icons, condition_codes)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def fingerprint(self) -> str:
+        """Content hash of every column (memoized); equal frames share cached charts"""
+        if 'fingerprint' not in self._memo:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(self.times.tobytes())
+            for name in self.NUMERIC_COLUMNS:
+                digest.update(getattr(self, name).tobytes())
+            digest.update(self.condition_codes.tobytes())
+            digest.update('\x1f'.join(self.conditions.tolist()).encode('utf-8'))
+            digest.update('\x1f'.join(self.icons.tolist()).encode('utf-8'))
+            self._memo['fingerprint'] = digest.hexdigest()
+        return self._memo['fingerprint']
+
+    def head(self, n: int) -> "ForecastFrame":
+        """First n steps (a view; memoized)"""
+        key = ('head', n)
+        if key not in self._memo:
+            self._memo[key] = ForecastFrame(
+                self.times[:n],
+                {name: getattr(self, name)[:n] for name in self.NUMERIC_COLUMNS},
+                self.conditions[:n],
+                self.icons[:n],
+                self.condition_codes[:n]
+            )
+        return self._memo[key]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """One step as a plain dict"""
+        return {
+            'datetime': self.times[i].astype(datetime),
+            'temperature': int(self.temperature[i]),
+            'feels_like': int(self.feels_like[i]),
+            'humidity': int(self.humidity[i]),
+            'condition': self.conditions[i],
+            'condition_code': int(self.condition_codes[i]),
+            'icon': self.icons[i],
+            'wind_speed': int(self.wind_speed[i]),
+            'rain': float(self.rain[i])
+        }
+
+    def daily(self) -> Dict[str, np.ndarray]:
+        """
+        Per-day aggregates (memoized)
+        Keys: date, min, max, mean (temperature) and rep, the index of the
+        first step at or after noon, or the day's first step if none is
+        """
+        if 'daily' not in self._memo:
+            days = self.times.astype('datetime64[D]')
+            hours = (self.times - days).astype('timedelta64[h]').astype(np.int64)
+            unique_days, starts, counts = np.unique(days, return_index=True, return_counts=True)
+
+            if len(self) == 0:
+                rep = starts
+                t_min = t_max = t_mean = np.array([], dtype=np.float64)
+            else:
+                t_min = np.minimum.reduceat(self.temperature, starts)
+                t_max = np.maximum.reduceat(self.temperature, starts)
+                t_mean = np.add.reduceat(self.temperature.astype(np.float64), starts) / counts
+
+                positions = np.arange(len(self))
+                after_noon = np.where(hours >= 12, positions, len(self))
+                first_after_noon = np.minimum.reduceat(after_noon, starts)
+                rep = np.where(first_after_noon < starts + counts, first_after_noon, starts)
+
+            self._memo['daily'] = {
+                'date': unique_days,
+                'min': t_min,
+                'max': t_max,
+                'mean': t_mean,
+                'rep': rep
+            }
+        return self._memo['daily']
+
+    def day_summary(self, day: date) -> Optional[Dict[str, Any]]:
+        """Aggregates plus the representative step for one calendar day"""
+        daily = self.daily()
+        matches = np.nonzero(daily['date'] == np.datetime64(day, 'D'))[0]
+        if len(matches) == 0:
+            return None
+        i = matches[0]
+        return {
+            'date': day,
+            'min': int(daily['min'][i]),
+            'max': int(daily['max'][i]),
+            'mean': float(daily['mean'][i]),
+            'rep': self.row(int(daily['rep'][i]))
+        }
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+IP Geolocation Module
+Races the configured IP geolocation providers and takes the first usable
+answer, so one slow or failing provider does not hold up location
+detection; results are cached per client IP. An offline range database
+(ip_database.py) answers first when one is configured.
+
+Developed by hafizullahkhokhar1
+"""
+
+import ipaddress
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeoutError, as_completed
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config import WeatherAppConfig
+from concurrency import get_executor
+from cache import location_cache
+from ip_database import get_ip_database
+from transport import http_get
+
+
+def _get_json(base: str, path: str) -> Optional[Dict[str, Any]]:
+    # One breaker per provider host: the path carries the client IP
+    response = http_get(f"{base}{path}", timeout=WeatherAppConfig.LOCATION_TIMEOUT,
+                        breaker=urlsplit(base).netloc)
+    if response.status_code != 200:
+        return None
+    return response.json()
+
+
+def _location(city: Optional[str], region: Optional[str], country: Optional[str],
+              latitude: Any, longitude: Any) -> Optional[Dict[str, Any]]:
+    """Build a location dict, or None if the coordinates are missing"""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if latitude == 0 and longitude == 0:
+        return None
+    return {
+        'city': city or 'Unknown',
+        'region': region or 'Unknown',
+        'country': country or 'Unknown',
+        'latitude': latitude,
+        'longitude': longitude
+    }
+
+
+def _from_ipinfo(ip: Optional[str]) -> Optional[Dict[str, Any]]:
+    base = WeatherAppConfig.IPINFO_BASE_URL
+    data = _get_json(base, f"/{ip}/json" if ip else "/json")
+    if not data or 'loc' not in data:
+        return None
+    loc = data['loc'].split(',')
+    if len(loc) != 2:
+        return None
+    return _location(data.get('city'), data.get('region'), data.get('country'), loc[0], loc[1])
+
+
+def _from_ipapi(ip: Optional[str]) -> Optional[Dict[str, Any]]:
+    base = WeatherAppConfig.IPAPI_BASE_URL
+    data = _get_json(base, f"/{ip}/json/" if ip else "/json/")
+    if not data or data.get('error'):
+        return None
+    return _location(data.get('city'), data.get('region'), data.get('country_code'),
+                     data.get('latitude'), data.get('longitude'))
+
+
+def _from_ipwhois(ip: Optional[str]) -> Optional[Dict[str, Any]]:
+    base = WeatherAppConfig.IPWHOIS_BASE_URL
+    data = _get_json(base, f"/{ip}" if ip else "/")
+    if not data or not data.get('success', True):
+        return None
+    return _location(data.get('city'), data.get('region'), data.get('country_code'),
+                     data.get('latitude'), data.get('longitude'))
+
+
+PROVIDERS: Dict[str, Callable[[Optional[str]], Optional[Dict[str, Any]]]] = {
+    'ipinfo': _from_ipinfo,
+    'ipapi': _from_ipapi,
+    'ipwhois': _from_ipwhois
+}
+
+# Races won per provider, for tuning the provider list
+provider_wins: Dict[str, int] = {}
+_wins_lock = threading.Lock()
+
+
+def public_ip(ip: Optional[str]) -> Optional[str]:
+    """
+    Normalize a client address
+    Returns None for missing, malformed, private and loopback addresses, in
+    which case providers locate the server's own public address instead
+    """
+    if not ip:
+        return None
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except ValueError:
+        return None
+    return str(address) if address.is_global else None
+
+
+def race_providers(ip: Optional[str] = None, providers: Optional[List[str]] = None,
+                   timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Query all providers at once and return the first usable location
+    Providers that fail or answer without coordinates are skipped. Once a
+    winner is found (or the timeout passes) calls that have not started
+    are cancelled; running ones finish in the background and are ignored.
+    """
+    if providers is None:
+        providers = WeatherAppConfig.GEOLOCATION_PROVIDERS
+    if timeout is None:
+        timeout = WeatherAppConfig.LOCATION_TIMEOUT
+
+    executor = get_executor()
+    futures = {executor.submit(PROVIDERS[name], ip): name for name in providers if name in PROVIDERS}
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            name = futures[future]
+            try:
+                location = future.result()
+            except Exception as e:
+                print(f"{name} geolocation failed: {e}")
+                continue
+            if location:
+                with _wins_lock:
+                    provider_wins[name] = provider_wins.get(name, 0) + 1
+                return location
+    except FuturesTimeoutError:
+        print(f"No geolocation provider answered within {timeout}s")
+    finally:
+        for future in futures:
+            future.cancel()
+    return None
+
+
+def locate(ip: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Location for a client IP (or for this server when ip is None)
+    The offline database is tried first when configured; provider results
+    are cached per address and concurrent lookups for one address share one race
+    """
+    ip = public_ip(ip)
+    database = get_ip_database() if ip else None
+    if database is not None:
+        location = database.lookup(ip)
+        if location is not None:
+            return location
+    return location_cache.get_or_load(('location', ip or 'self'), lambda: race_providers(ip))
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Offline IP Database Module
+Local IP-to-location lookup over a memory-mapped range table (IPv4 and
+IPv6), so auto-detect does not need a geolocation provider
+
+The file is built once from a range CSV (DB-IP "IP to City Lite" layout:
+ip_start, ip_end, continent, country, region, city, latitude, longitude):
+
+    python ip_database.py dbip-city-lite.csv.gz data/ip-city.ipdb
+
+Opening it only maps the file, whatever its size; lookups are binary
+searches over the mapped arrays, and the pages are shared through the OS
+page cache by every process that opens the same file.
+
+Developed by hafizullahkhokhar1
+"""
+
+import csv
+import gzip
+import ipaddress
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from config import WeatherAppConfig
+
+
+MAGIC = b'WXIPDB01'
+# magic, IPv4 ranges, IPv6 ranges, locations, string bytes
+HEADER = struct.Struct('<8sIIIQ')
+FIELD_SEP = '\x1f'
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(n4: int, n6: int, n_locations: int) -> Dict[str, Tuple[int, str, int]]:
+    """Section name -> (offset, dtype, count); shared by the builder and the reader"""
+    sections = [
+        ('v4_starts', '<u4', n4), ('v4_ends', '<u4', n4), ('v4_locations', '<u4', n4),
+        ('v6_starts', 'S16', n6), ('v6_ends', 'S16', n6), ('v6_locations', '<u4', n6),
+        ('latitudes', '<f4', n_locations), ('longitudes', '<f4', n_locations),
+        ('string_offsets', '<u4', n_locations + 1)
+    ]
+    layout = {}
+    offset = _align(HEADER.size)
+    for name, dtype, count in sections:
+        layout[name] = (offset, dtype, count)
+        offset = _align(offset + np.dtype(dtype).itemsize * count)
+    layout['strings'] = (offset, 'u1', 0)
+    return layout
+
+
+class IpDatabase:
+    """Read-only view of a built range table"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n4, n6, n_locations, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an IP database (bad magic)")
+
+        layout = _layout(n4, n6, n_locations)
+        arrays = {name: np.frombuffer(self._map, dtype=dtype, count=count, offset=offset)
+                  for name, (offset, dtype, count) in layout.items() if name != 'strings'}
+        self._v4 = (arrays['v4_starts'], arrays['v4_ends'], arrays['v4_locations'])
+        self._v6 = (arrays['v6_starts'], arrays['v6_ends'], arrays['v6_locations'])
+        self._latitudes = arrays['latitudes']
+        self._longitudes = arrays['longitudes']
+        self._string_offsets = arrays['string_offsets']
+        self._strings_at = layout['strings'][0]
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._v4[0]) + len(self._v6[0])
+
+    def _find(self, tables: Tuple[np.ndarray, np.ndarray, np.ndarray], key: Any) -> Optional[int]:
+        starts, ends, locations = tables
+        i = int(np.searchsorted(starts, key, side='right')) - 1
+        if i < 0 or ends[i] < key:
+            return None
+        return int(locations[i])
+
+    def _location(self, row: int) -> Dict[str, Any]:
+        start = self._strings_at + int(self._string_offsets[row])
+        end = self._strings_at + int(self._string_offsets[row + 1])
+        city, region, country = self._map[start:end].decode('utf-8').split(FIELD_SEP)
+        return {
+            'city': city or 'Unknown',
+            'region': region or 'Unknown',
+            'country': country or 'Unknown',
+            'latitude': round(float(self._latitudes[row]), 4),
+            'longitude': round(float(self._longitudes[row]), 4)
+        }
+
+    def lookup(self, ip: str) -> Optional[Dict[str, Any]]:
+        """Location for an address, or None if it is malformed or not covered"""
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+
+        if address.version == 4:
+            row = self._find(self._v4, np.uint32(int(address)))
+        else:
+            row = self._find(self._v6, np.bytes_(address.packed))
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._location(row)
+
+    def close(self):
+        self._map.close()
+
+
+def build(ranges: Iterable[Tuple[str, str, str, str, str, float, float]], path: str) -> Tuple[int, int]:
+    """
+    Write a database from (ip_start, ip_end, city, region, country, lat, lon)
+    Ranges must not overlap. The file is written next to path and moved into
+    place, so processes that have the old file mapped keep working.
+    Returns the number of (IPv4, IPv6) ranges written.
+    """
+    locations: Dict[Tuple, int] = {}
+    v4: list = []
+    v6: list = []
+    for start, end, city, region, country, lat, lon in ranges:
+        try:
+            start, end = ipaddress.ip_address(start), ipaddress.ip_address(end)
+        except ValueError:
+            continue
+        if start.version != end.version or int(end) < int(start):
+            continue
+        record = (city, region, country, float(lat), float(lon))
+        row = locations.setdefault(record, len(locations))
+        (v4 if start.version == 4 else v6).append((int(start), int(end), row))
+
+    v4.sort()
+    v6.sort()
+    records = list(locations)
+
+    encoded = [FIELD_SEP.join(record[:3]).encode('utf-8') for record in records]
+    string_offsets = np.zeros(len(encoded) + 1, dtype='<u4')
+    np.cumsum([len(text) for text in encoded], out=string_offsets[1:])
+    strings = b''.join(encoded)
+
+    sections = {
+        'v4_starts': np.array([r[0] for r in v4], dtype='<u4'),
+        'v4_ends': np.array([r[1] for r in v4], dtype='<u4'),
+        'v4_locations': np.array([r[2] for r in v4], dtype='<u4'),
+        # Big-endian bytes sort in address order
+        'v6_starts': np.array([r[0].to_bytes(16, 'big') for r in v6], dtype='S16'),
+        'v6_ends': np.array([r[1].to_bytes(16, 'big') for r in v6], dtype='S16'),
+        'v6_locations': np.array([r[2] for r in v6], dtype='<u4'),
+        'latitudes': np.array([record[3] for record in records], dtype='<f4'),
+        'longitudes': np.array([record[4] for record in records], dtype='<f4'),
+        'string_offsets': string_offsets
+    }
+    layout = _layout(len(v4), len(v6), len(records))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as fh:
+        fh.write(HEADER.pack(MAGIC, len(v4), len(v6), len(records), len(strings)))
+        for name, array in sections.items():
+            fh.seek(layout[name][0])
+            fh.write(array.tobytes())
+        fh.seek(layout['strings'][0])
+        fh.write(strings)
+    os.replace(tmp_path, path)
+    return len(v4), len(v6)
+
+
+def read_csv(path: str) -> Iterable[Tuple[str, str, str, str, str, float, float]]:
+    """Ranges from a DB-IP city CSV (optionally gzipped); malformed lines are skipped"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as fh:
+        for fields in csv.reader(fh):
+            if len(fields) < 8:
+                continue
+            try:
+                yield (fields[0], fields[1], fields[5], fields[4], fields[3],
+                       float(fields[6]), float(fields[7]))
+            except ValueError:
+                continue  # header line
+
+
+_database: Optional[IpDatabase] = None
+_database_lock = threading.Lock()
+_database_failed = False
+
+
+def get_ip_database() -> Optional[IpDatabase]:
+    """Get the process-wide database, opening it on first use (None if not configured)"""
+    global _database, _database_failed
+    path = WeatherAppConfig.IP_DATABASE_PATH
+    if _database is None and path and not _database_failed:
+        with _database_lock:
+            if _database is None and not _database_failed:
+                try:
+                    _database = IpDatabase(path)
+                except (OSError, ValueError) as e:
+                    _database_failed = True
+                    print(f"IP database unavailable: {e}")
+    return _database
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python ip_database.py <ranges.csv[.gz]> <output.ipdb>")
+        sys.exit(1)
+    count4, count6 = build(read_csv(sys.argv[1]), sys.argv[2])
+    print(f"Wrote {count4} IPv4 and {count6} IPv6 ranges to {sys.argv[2]}")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+API Key Pool Module
+Process-wide pool of OpenWeatherMap keys with per-key rate limits and
+health tracking, so one throttled or revoked key does not fail requests
+while the others sit idle
+
+Developed by hafizullahkhokhar1
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+import requests
+
+from config import WeatherAppConfig
+from concurrency import TokenBucket
+from transport import http_get
+
+
+class NoKeyAvailable(requests.exceptions.RequestException):
+    """Every key is disabled or out of budget"""
+
+
+class _KeyState:
+    """Budget and health of one key"""
+
+    def __init__(self, key: str, calls_per_minute: float):
+        self.key = key
+        self.bucket = TokenBucket(rate=calls_per_minute / 60.0, capacity=calls_per_minute)
+        self.disabled_until = 0.0
+        self.failures = 0
+        self.calls = 0
+        self.last_status: Optional[int] = None
+
+
+class ApiKeyPool:
+    """
+    Thread-safe key selection
+    acquire() hands out the healthy key with the most remaining budget;
+    report() disables a key after a 401, and after a 429 for the server's
+    Retry-After (exponential backoff when the header is missing)
+    """
+
+    def __init__(self, keys: List[str], calls_per_minute: float = 60,
+                 backoff_base: float = 60, backoff_max: float = 3600):
+        # Order-preserving dedupe; the same key listed twice shares one budget
+        self._keys = [_KeyState(key, calls_per_minute) for key in dict.fromkeys(keys)]
+        self._by_key = {state.key: state for state in self._keys}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def acquire(self) -> str:
+        """Take one call from the healthy key with the most budget left"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [state for state in self._keys if state.disabled_until <= now]
+            for state in sorted(healthy, key=lambda s: s.bucket.available(), reverse=True):
+                if state.bucket.try_acquire():
+                    state.calls += 1
+                    return state.key
+        raise NoKeyAvailable("No API key is currently available (all disabled or rate limited)")
+
+    def report(self, key: str, status_code: int, retry_after: Optional[float] = None):
+        """Record the outcome of a call made with key"""
+        state = self._by_key.get(key)
+        if state is None:
+            return
+
+        with self._lock:
+            state.last_status = status_code
+            if status_code == 401:
+                # Invalid or revoked: retrying soon will not help
+                state.failures += 1
+                state.disabled_until = time.monotonic() + self.backoff_max
+            elif status_code == 429:
+                state.failures += 1
+                if retry_after is not None:
+                    backoff = max(0.0, retry_after)
+                else:
+                    backoff = min(self.backoff_max, self.backoff_base * 2 ** (state.failures - 1))
+                state.disabled_until = time.monotonic() + backoff
+            elif status_code < 500:
+                state.failures = 0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-key budget and health (keys are shown truncated)"""
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                'key': f"{state.key[:4]}…",
+                'available': state.bucket.available(),
+                'calls': state.calls,
+                'failures': state.failures,
+                'disabled_for': max(0.0, state.disabled_until - now),
+                'last_status': state.last_status
+            } for state in self._keys]
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Retry-After in seconds (delta-seconds or HTTP-date), or None if absent"""
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def owm_get(url: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None, pool: Optional["ApiKeyPool"] = None) -> requests.Response:
+    """
+    GET an OpenWeatherMap URL with a key from the pool
+    A 401 or 429 disables that key and the call is retried once per
+    remaining key; raises NoKeyAvailable when no key has budget
+    """
+    pool = pool or weather_key_pool
+    response = None
+    for _ in range(len(pool)):
+        key = pool.acquire()
+        response = http_get(url, params={**(params or {}), 'appid': key}, timeout=timeout)
+        pool.report(key, response.status_code, retry_after(response.headers))
+        if response.status_code not in (401, 429):
+            return response
+    if response is None:
+        raise NoKeyAvailable("No API keys configured")
+    return response
+
+
+async def owm_get_async(get: Callable[[str, Dict[str, Any]], Awaitable[Tuple[int, Any, Mapping[str, str]]]],
+                        url: str, params: Optional[Dict[str, Any]] = None,
+                        pool: Optional["ApiKeyPool"] = None) -> Tuple[int, Any]:
+    """
+    owm_get for async clients
+    get(url, params) makes the request and returns (status, body, headers);
+    keys are acquired, reported and retried exactly as in owm_get.
+    Returns (status, body) of the last attempt.
+    """
+    pool = pool or weather_key_pool
+    result = None
+    for _ in range(len(pool)):
+        key = pool.acquire()
+        status, body, headers = await get(url, {**(params or {}), 'appid': key})
+        pool.report(key, status, retry_after(headers))
+        result = status, body
+        if status not in (401, 429):
+            return result
+    if result is None:
+        raise NoKeyAvailable("No API keys configured")
+    return result
+
+
+weather_key_pool = ApiKeyPool(WeatherAppConfig.OPENWEATHER_API_KEYS,
+                              calls_per_minute=WeatherAppConfig.OPENWEATHER_CALLS_PER_MINUTE,
+                              backoff_base=WeatherAppConfig.API_KEY_BACKOFF_BASE,
+                              backoff_max=WeatherAppConfig.API_KEY_BACKOFF_MAX)
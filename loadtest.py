@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Load Test Module
+Drives WeatherAPI or the Streamlit app against the mock OpenWeatherMap
+server at a target concurrency and reports latency percentiles,
+throughput and upstream calls; with thresholds it doubles as a
+regression gate (exit code 1 when one is missed)
+
+    python loadtest.py --target api --requests 2000 --concurrency 32
+    python loadtest.py --target app --requests 200 --concurrency 4 --max-p95 250
+    python loadtest.py --url http://127.0.0.1:8765 --json report.json
+
+Without --url a mock server is started in-process (see mock_owm.py for
+the latency and fault flags).
+
+Developed by hafizullahkhokhar1
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from mock_owm import add_fault_arguments, settings_from_args, start_mock_server
+
+
+def load_cities(path: str, limit: int) -> List[Tuple[str, float, float]]:
+    """The limit most populous cities from a cities.tsv file"""
+    rows = []
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            if not line.strip() or line.startswith('#'):
+                continue
+            name, _, _, lat, lon, population = line.rstrip('\n').split('\t')[:6]
+            rows.append((int(population or 0), name, float(lat), float(lon)))
+    rows.sort(reverse=True)
+    return [(name, lat, lon) for _, name, lat, lon in rows[:limit]]
+
+
+def zipf_picker(count: int, seed: Optional[int]) -> Callable[[], int]:
+    """Index picker where rank r is chosen with weight 1/(r+1), like real traffic"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    weights = [1 / (rank + 1) for rank in range(count)]
+
+    def pick() -> int:
+        with lock:
+            return rng.choices(range(count), weights)[0]
+    return pick
+
+
+def upstream_stats(url: str) -> Dict[str, Dict[str, int]]:
+    return requests.get(f"{url}/__stats", timeout=5).json()['endpoints']
+
+
+def upstream_delta(before: Dict[str, Dict[str, int]], after: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    delta = {}
+    for endpoint, counts in after.items():
+        previous = before.get(endpoint, {})
+        delta[endpoint] = {name: value - previous.get(name, 0) for name, value in counts.items()}
+    return delta
+
+
+def run_workers(concurrency: int, total: int, setup: Callable[[], Any],
+                request: Callable[[Any], bool]) -> Tuple[List[float], int, float]:
+    """
+    Issue total requests from concurrency threads
+    setup() builds per-thread state (not timed); request(state) returns
+    False on an error. Returns (latencies in seconds, errors, wall time).
+    """
+    latencies: List[float] = []
+    errors = [0]
+    remaining = [total]
+    lock = threading.Lock()
+    ready = threading.Barrier(concurrency + 1)
+
+    def worker():
+        state = setup()
+        ready.wait()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+            started = time.perf_counter()
+            try:
+                ok = request(state)
+            except Exception as e:
+                print(f"Request failed: {e}")
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker, name=f"load-{i}", daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.perf_counter() - started
+
+
+def api_target(cities: List[Tuple[str, float, float]], pick: Callable[[], int]):
+    """One request = current weather + forecast for a city, as the dashboard loads them"""
+    from weather import WeatherAPI
+
+    def setup():
+        return WeatherAPI()
+
+    def request(api) -> bool:
+        _, lat, lon = cities[pick()]
+        result = api.get_weather_and_forecast((lat, lon))
+        return result['weather'] is not None and result['forecast'] is not None and not result['errors']
+    return setup, request
+
+
+def _app_worker(count: int, cities: List[Tuple[str, float, float]],
+                seed: Optional[int]) -> Tuple[List[float], int, float]:
+    """Process body for the app target: count reruns on one AppTest session"""
+    from streamlit.testing.v1 import AppTest
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    pick = zipf_picker(len(cities), seed)
+
+    def setup():
+        at = AppTest.from_file(app_path, default_timeout=60)
+        at.run()
+        return at
+
+    def request(at) -> bool:
+        name, _, _ = cities[pick()]
+        at.text_input[0].input(name).run()
+        return not at.exception and not at.error
+    return run_workers(1, count, setup, request)
+
+
+def run_app_processes(concurrency: int, total: int, cities: List[Tuple[str, float, float]],
+                      seed: Optional[int]) -> Tuple[List[float], int, float]:
+    """
+    App target: one request = one rerun of app.py after searching for a city
+    AppTest swaps process-global Streamlit state, so each virtual user is a
+    separate process; process-wide caches are per worker, as with replicas.
+    Wall time is the slowest worker's, excluding process start-up.
+    """
+    context = multiprocessing.get_context('spawn')
+    shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    with ProcessPoolExecutor(max_workers=concurrency, mp_context=context) as pool:
+        futures = [pool.submit(_app_worker, share, cities, None if seed is None else seed + i)
+                   for i, share in enumerate(shares) if share]
+        results = [future.result() for future in futures]
+
+    latencies = [value for worker_latencies, _, _ in results for value in worker_latencies]
+    return latencies, sum(errors for _, errors, _ in results), max(wall for _, _, wall in results)
+
+
+def summarize(latencies: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    ms = sorted(value * 1000 for value in latencies)
+    cuts = statistics.quantiles(ms, n=100, method='inclusive') if len(ms) > 1 else ms * 99
+    return {
+        'requests': len(ms),
+        'errors': errors,
+        'duration_s': round(wall, 3),
+        'rps': round(len(ms) / wall, 1) if wall else 0.0,
+        'latency_ms': {
+            'p50': round(cuts[49], 2),
+            'p95': round(cuts[94], 2),
+            'p99': round(cuts[98], 2),
+            'mean': round(statistics.fmean(ms), 2),
+            'max': round(ms[-1], 2)
+        }
+    }
+
+
+def check_gates(report: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Threshold violations, as readable lines"""
+    failures = []
+    latency = report['latency_ms']
+    for name, limit in (('p95', args.max_p95), ('p99', args.max_p99)):
+        if limit is not None and latency[name] > limit:
+            failures.append(f"{name} {latency[name]} ms > {limit} ms")
+    if args.min_rps is not None and report['rps'] < args.min_rps:
+        failures.append(f"throughput {report['rps']} req/s < {args.min_rps} req/s")
+    if args.max_upstream is not None and report['upstream_per_request'] > args.max_upstream:
+        failures.append(f"upstream calls per request {report['upstream_per_request']} > {args.max_upstream}")
+    if args.max_error_rate is not None and report['errors'] > args.max_error_rate * report['requests']:
+        failures.append(f"{report['errors']} errors in {report['requests']} requests")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test against the mock OpenWeatherMap server")
+    parser.add_argument('--target', choices=['api', 'app'], default='api')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--cities', type=int, default=50, help="distinct cities, Zipf-weighted")
+    parser.add_argument('--url', help="use a running mock_owm.py instead of starting one")
+    parser.add_argument('--calls-per-minute', type=int, default=1_000_000,
+                        help="per-key budget for the key pool (the default lifts the plan limit)")
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--max-p95', type=float, help="fail above this p95 (ms)")
+    parser.add_argument('--max-p99', type=float, help="fail above this p99 (ms)")
+    parser.add_argument('--min-rps', type=float, help="fail below this throughput")
+    parser.add_argument('--max-upstream', type=float, help="fail above this many upstream calls per request")
+    parser.add_argument('--max-error-rate', type=float, help="fail above this fraction of failed requests")
+    add_fault_arguments(parser)
+    args = parser.parse_args(argv)
+
+    url = args.url
+    if url is None:
+        _, url = start_mock_server(settings=settings_from_args(args))
+    url = url.rstrip('/')
+
+    # Read by config.py at import, so set before any app module is loaded
+    os.environ['WEATHER_OWM_URL'] = url
+    os.environ['WEATHER_OWM_CALLS_PER_MINUTE'] = str(args.calls_per_minute)
+    from config import WeatherAppConfig
+    from cache import response_cache
+
+    cities = load_cities(WeatherAppConfig.CITY_INDEX_PATH, args.cities)
+
+    print(f"🚀 {args.requests} {args.target} requests, concurrency {args.concurrency}, "
+          f"{len(cities)} cities, upstream {url}")
+    before = upstream_stats(url)
+    if args.target == 'api':
+        setup, request = api_target(cities, zipf_picker(len(cities), args.seed))
+        latencies, errors, wall = run_workers(args.concurrency, args.requests, setup, request)
+    else:
+        latencies, errors, wall = run_app_processes(args.concurrency, args.requests, cities, args.seed)
+    upstream = upstream_delta(before, upstream_stats(url))
+
+    report = {'target': args.target, 'concurrency': args.concurrency, 'cities': len(cities)}
+    report.update(summarize(latencies, errors, wall))
+    upstream_total = sum(counts.get('requests', 0) for counts in upstream.values())
+    report['upstream'] = upstream
+    report['upstream_total'] = upstream_total
+    report['upstream_per_request'] = round(upstream_total / max(len(latencies), 1), 3)
+    if args.target == 'api':
+        report['cache'] = response_cache.stats()
+
+    latency = report['latency_ms']
+    print(f"\n⏱️ p50 {latency['p50']} ms | p95 {latency['p95']} ms | p99 {latency['p99']} ms | "
+          f"max {latency['max']} ms")
+    print(f"📈 {report['rps']} req/s over {report['duration_s']} s, {errors} errors")
+    print(f"🌐 {upstream_total} upstream calls ({report['upstream_per_request']} per request)")
+    for endpoint, counts in sorted(upstream.items()):
+        print(f"   {endpoint}: {counts}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\n📝 Report written to {args.json}")
+
+    failures = check_gates(report, args)
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
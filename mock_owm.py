@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Mock OpenWeatherMap Server Module
+Local stand-in for the /data/2.5/weather, /data/2.5/forecast and
+/geo/1.0/direct endpoints, with configurable latency, server errors and
+429 throttling, so load tests do not spend real API quota
+
+    python mock_owm.py --port 8765 --latency lognormal:80,0.4 --error-rate 0.01
+    WEATHER_OWM_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Responses are deterministic per location. GET /__stats returns request
+counts per endpoint; GET /__reset clears them.
+
+Developed by hafizullahkhokhar1
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+# OpenWeatherMap condition ids with their description and icon
+CONDITIONS = [
+    (800, 'Clear', 'clear sky', '01'),
+    (801, 'Clouds', 'few clouds', '02'),
+    (803, 'Clouds', 'broken clouds', '04'),
+    (500, 'Rain', 'light rain', '10'),
+    (502, 'Rain', 'heavy intensity rain', '10'),
+    (211, 'Thunderstorm', 'thunderstorm', '11'),
+    (600, 'Snow', 'light snow', '13'),
+    (701, 'Mist', 'mist', '50')
+]
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Build a latency sampler (seconds) from a spec in milliseconds:
+    fixed:MS, uniform:LOW,HIGH, normal:MEAN,STDDEV or lognormal:MEDIAN,SIGMA
+    """
+    kind, _, args = spec.partition(':')
+    values = [float(v) for v in args.split(',')] if args else [0.0]
+    if kind == 'fixed':
+        return lambda rng: values[0] / 1000
+    if kind == 'uniform':
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == 'normal':
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == 'lognormal':
+        mu, sigma = math.log(max(values[0], 1e-3)), values[1]
+        return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class MockSettings:
+    """Fault and latency settings shared by all handler threads"""
+
+    def __init__(self, latency: str = 'fixed:0', error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 1, seed: Optional[int] = None):
+        self.latency_spec = latency
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def draw(self) -> Tuple[float, float]:
+        """(latency in seconds, uniform 0-1 for fault injection)"""
+        with self._lock:
+            return self.latency(self._rng), self._rng.random()
+
+    def count(self, endpoint: str, outcome: str):
+        with self._lock:
+            counts = self.counts.setdefault(endpoint, {'requests': 0})
+            counts['requests'] += 1
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'endpoints': {name: dict(counts) for name, counts in self.counts.items()},
+                'total': sum(counts['requests'] for counts in self.counts.values()),
+                'settings': {'latency': self.latency_spec, 'error_rate': self.error_rate,
+                             'throttle_rate': self.throttle_rate}
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+
+def _place(params: Dict[str, str]) -> Tuple[str, str, float, float]:
+    """Name, country and coordinates for a q= or lat=/lon= query"""
+    if 'q' in params:
+        parts = [part.strip() for part in params['q'].split(',')]
+        seed = zlib.crc32(params['q'].lower().encode('utf-8'))
+        country = parts[-1].upper()[:2] if len(parts) > 1 else 'XX'
+        return parts[0].title(), country, (seed % 18000) / 100 - 90, (seed // 18000 % 36000) / 100 - 180
+    lat, lon = float(params.get('lat', 0)), float(params.get('lon', 0))
+    return f"Place {lat:.2f},{lon:.2f}", 'XX', lat, lon
+
+
+def _conditions(rng: random.Random) -> Dict[str, Any]:
+    condition_id, main, description, icon = rng.choice(CONDITIONS)
+    return {'id': condition_id, 'main': main, 'description': description,
+            'icon': f"{icon}{rng.choice('dn')}"}
+
+
+def weather_payload(params: Dict[str, str]) -> Dict[str, Any]:
+    """Current weather in the OpenWeatherMap response layout"""
+    name, country, lat, lon = _place(params)
+    rng = random.Random(zlib.crc32(f"{lat:.3f},{lon:.3f}".encode()))
+    now = int(time.time())
+    temp = rng.uniform(-10, 40)
+    return {
+        'coord': {'lon': lon, 'lat': lat},
+        'weather': [_conditions(rng)],
+        'main': {'temp': temp, 'feels_like': temp + rng.uniform(-3, 3),
+                 'temp_min': temp - 2, 'temp_max': temp + 2,
+                 'pressure': rng.randint(990, 1030), 'humidity': rng.randint(10, 100)},
+        'visibility': rng.choice([10000, 8000, 4000]),
+        'wind': {'speed': rng.uniform(0, 15), 'deg': rng.randint(0, 359)},
+        'clouds': {'all': rng.randint(0, 100)},
+        'dt': now,
+        'sys': {'country': country, 'sunrise': now - 6 * 3600, 'sunset': now + 6 * 3600},
+        'timezone': 0,
+        'name': name,
+        'cod': 200
+    }
+
+
+def forecast_items(rng: random.Random, start: int, count: int) -> list:
+    """count 3-hourly forecast entries from start (epoch seconds)"""
+    items = []
+    for i in range(count):
+        dt = start + i * 10800
+        temp = rng.uniform(-10, 40)
+        item = {
+            'dt': dt,
+            'main': {'temp': temp, 'feels_like': temp + rng.uniform(-3, 3),
+                     'temp_min': temp - 1, 'temp_max': temp + 1,
+                     'pressure': rng.randint(990, 1030), 'humidity': rng.randint(10, 100)},
+            'weather': [_conditions(rng)],
+            'clouds': {'all': rng.randint(0, 100)},
+            'wind': {'speed': rng.uniform(0, 15), 'deg': rng.randint(0, 359)},
+            'visibility': 10000,
+            'pop': round(rng.random(), 2),
+            'dt_txt': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(dt))
+        }
+        if item['weather'][0]['main'] == 'Rain':
+            item['rain'] = {'3h': round(rng.uniform(0.1, 8), 2)}
+        items.append(item)
+    return items
+
+
+def forecast_payload(params: Dict[str, str]) -> Dict[str, Any]:
+    """3-hourly forecast in the OpenWeatherMap response layout"""
+    name, country, lat, lon = _place(params)
+    rng = random.Random(zlib.crc32(f"forecast {lat:.3f},{lon:.3f}".encode()))
+    count = min(int(params.get('cnt', 40)), 40)
+    start = int(time.time()) // 10800 * 10800 + 10800
+    return {
+        'cod': '200',
+        'cnt': count,
+        'list': forecast_items(rng, start, count),
+        'city': {'name': name, 'country': country, 'coord': {'lat': lat, 'lon': lon},
+                 'timezone': 0, 'sunrise': start - 6 * 3600, 'sunset': start + 6 * 3600}
+    }
+
+
+def geocode_payload(params: Dict[str, str]) -> list:
+    """Direct geocoding results in the OpenWeatherMap response layout"""
+    name, country, lat, lon = _place({'q': params.get('q', '')})
+    limit = min(int(params.get('limit', 5)), 5)
+    return [{'name': name if i == 0 else f"{name} {i + 1}", 'lat': lat, 'lon': lon + i * 0.1,
+             'country': country, 'state': 'Mock'} for i in range(limit)]
+
+
+ROUTES = {
+    '/data/2.5/weather': weather_payload,
+    '/data/2.5/forecast': forecast_payload,
+    '/geo/1.0/direct': geocode_payload
+}
+
+
+def _handler_class(settings: MockSettings):
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+        def log_message(self, format, *args):
+            pass  # one line per request would drown the load report
+
+        def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+            if parts.path == '/__stats':
+                return self._send(200, settings.snapshot())
+            if parts.path == '/__reset':
+                settings.reset()
+                return self._send(200, {'reset': True})
+
+            route = ROUTES.get(parts.path)
+            if route is None:
+                return self._send(404, {'cod': '404', 'message': 'Not found'})
+            if 'appid' not in params:
+                settings.count(parts.path, 'unauthorized')
+                return self._send(401, {'cod': 401, 'message': 'Invalid API key'})
+
+            latency, roll = settings.draw()
+            time.sleep(latency)
+
+            if roll < settings.throttle_rate:
+                settings.count(parts.path, 'throttled')
+                return self._send(429, {'cod': 429, 'message': 'Too many requests'},
+                                  {'Retry-After': str(settings.retry_after)})
+            if roll < settings.throttle_rate + settings.error_rate:
+                settings.count(parts.path, 'errors')
+                return self._send(500, {'cod': 500, 'message': 'Internal error'})
+            if params.get('q', '').lower().startswith('nowhere'):
+                settings.count(parts.path, 'not_found')
+                return self._send(404, {'cod': '404', 'message': 'city not found'})
+
+            settings.count(parts.path, 'ok')
+            return self._send(200, route(params))
+
+    return MockHandler
+
+
+def start_mock_server(port: int = 0, host: str = '127.0.0.1',
+                      settings: Optional[MockSettings] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve in a daemon thread; returns the server and its root URL"""
+    settings = settings or MockSettings()
+    server = ThreadingHTTPServer((host, port), _handler_class(settings))
+    server.daemon_threads = True
+    server.settings = settings
+    threading.Thread(target=server.serve_forever, name="mock-owm", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    """Latency and fault flags shared with loadtest.py"""
+    parser.add_argument('--latency', default='lognormal:80,0.4',
+                        help="fixed:MS, uniform:LOW,HIGH, normal:MEAN,SD or lognormal:MEDIAN,SIGMA")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument('--retry-after', type=int, default=1, help="Retry-After seconds sent with a 429")
+    parser.add_argument('--seed', type=int, default=None)
+
+
+def settings_from_args(args: argparse.Namespace) -> MockSettings:
+    return MockSettings(latency=args.latency, error_rate=args.error_rate,
+                        throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock OpenWeatherMap server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), _handler_class(settings_from_args(args)))
+    server.daemon_threads = True
+    print(f"Mock OpenWeatherMap on http://{args.host}:{args.port} ({args.latency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Persistent Cache Module
+Optional SQLite-backed tier under the in-memory response cache, so a
+restarted worker can serve warm data instead of hitting OpenWeatherMap
+
+Values are pickled and zlib-compressed. Writes are queued and applied by a
+background thread, off the request path.
+
+Developed by hafizullahkhokhar1
+"""
+
+import atexit
+import pickle
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Hashable, Iterable, List, Optional, Tuple
+
+
+class PersistentCache:
+    """SQLite key/value store with absolute expiry times and bounded size"""
+
+    def __init__(self, path: str, max_entries: int = 20000, compact_interval: float = 600,
+                 schema_version: int = 1):
+        self.path = path
+        # Part of every key, so entries written with an older value layout are ignored
+        self.schema_version = schema_version
+        self.max_entries = max_entries
+        self.compact_interval = compact_interval
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # only applies to a new file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " stored_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)")
+        self._lock = threading.Lock()
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Any, float, float]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="persistent-cache-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _encode_key(self, key: Hashable) -> str:
+        return f"v{self.schema_version}:{key!r}"
+
+    @staticmethod
+    def _encode_value(value: Any) -> bytes:
+        return zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _decode_value(blob: bytes) -> Any:
+        return pickle.loads(zlib.decompress(blob))
+
+    def get(self, key: Hashable) -> Tuple[Any, float]:
+        """
+        Look up a value
+        Returns (value, remaining_ttl_seconds), or (None, 0) when missing/expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (self._encode_key(key),)
+            ).fetchone()
+
+        now = time.time()
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None, 0
+
+        try:
+            value = self._decode_value(row[0])
+        except Exception as e:
+            print(f"Discarding unreadable cache entry: {e}")
+            self.misses += 1
+            return None, 0
+
+        self.hits += 1
+        return value, row[1] - now
+
+    def put(self, key: Hashable, value: Any, ttl: float):
+        """Queue a value for writing; encoding happens on the writer thread"""
+        now = time.time()
+        self._queue.put((self._encode_key(key), value, now + ttl, now))
+
+    def delete(self, key: Hashable):
+        """Remove an entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (self._encode_key(key),))
+
+    def compact(self):
+        """Drop expired entries and trim to max_entries, oldest first"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.execute("PRAGMA incremental_vacuum")
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until queued writes have been applied"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        """Apply pending writes and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5.0)
+
+    def _encode_rows(self, items: Iterable[Tuple[str, Any, float, float]]) -> List[Tuple[str, bytes, float, float]]:
+        """Encode queued items; a value that cannot be pickled is logged and skipped"""
+        rows = []
+        for key, value, expires_at, stored_at in items:
+            try:
+                rows.append((key, self._encode_value(value), expires_at, stored_at))
+            except Exception as e:
+                # pickle raises TypeError/AttributeError for locks, lambdas and local classes
+                print(f"Not persisting {key}: {type(e).__name__}: {e}")
+        return rows
+
+    def _write_loop(self):
+        last_compact = time.monotonic()
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Group whatever else is already queued into one transaction
+            while item is not None:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+
+            try:
+                rows = self._encode_rows(filter(None, batch))
+                if rows:
+                    with self._lock:
+                        self._conn.execute("BEGIN")
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO entries (key, value, expires_at, stored_at)"
+                            " VALUES (?, ?, ?, ?)", rows
+                        )
+                        self._conn.execute("COMMIT")
+                    self.writes += len(rows)
+
+                if time.monotonic() - last_compact >= self.compact_interval:
+                    self.compact()
+                    last_compact = time.monotonic()
+            except Exception as e:
+                # Never let one bad batch stop the writer thread
+                print(f"Persistent cache write failed: {e}")
+                with self._lock:
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if batch[-1] is None:
+                return
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Refresh-Ahead Scheduler Module
+Keeps frequently viewed locations warm: entries that are read often are
+reloaded in the background shortly before they expire, so users asking
+for hot cities are always served from cache
+
+Developed by hafizullahkhokhar1
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from config import WeatherAppConfig
+from concurrency import TokenBucket
+from cache import TTLCache, response_cache
+
+
+class _Tracked:
+    """Access score and reload details for one cache key"""
+
+    def __init__(self, loader: Callable[[], Any], ttl: Optional[float], lead: float):
+        self.loader = loader
+        self.ttl = ttl
+        self.lead = lead
+        self.score = 0.0
+        self.last_access = time.monotonic()
+
+
+class RefreshScheduler:
+    """
+    Background refresh-ahead for a TTLCache
+    Access frequency is an exponentially decayed count per key. A pass runs
+    every check_interval seconds and reloads hot keys whose entries expire
+    within their (jittered) lead time, hottest first, within a concurrency
+    cap and an upstream-call budget.
+    """
+
+    def __init__(self, cache: TTLCache,
+                 ahead: float = 30,
+                 jitter: float = 0.5,
+                 check_interval: float = 5,
+                 concurrency: int = 4,
+                 quota_per_minute: float = 30,
+                 min_score: float = 3.0,
+                 half_life: float = 600,
+                 max_tracked: int = 1024):
+        self.cache = cache
+        self.ahead = ahead
+        self.jitter = jitter
+        self.check_interval = check_interval
+        self.concurrency = concurrency
+        self.min_score = min_score
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+
+        self.quota = TokenBucket(rate=quota_per_minute / 60.0, capacity=quota_per_minute)
+
+        self._tracked: Dict[Hashable, _Tracked] = {}
+        self._in_flight: set = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.refreshes = 0
+        self.failures = 0
+        self.over_quota = 0
+
+    def _lead(self) -> float:
+        # Per-entry lead time, so entries loaded together do not refresh together
+        return self.ahead * (1 - self.jitter * random.random())
+
+    def _decayed(self, entry: _Tracked, now: float) -> float:
+        return entry.score * 0.5 ** ((now - entry.last_access) / self.half_life)
+
+    def track(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None):
+        """Record a read of key and remember how to reload it"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tracked.get(key)
+            if entry is None:
+                if len(self._tracked) >= self.max_tracked:
+                    self._evict_coldest(now)
+                entry = self._tracked[key] = _Tracked(loader, ttl, self._lead())
+            entry.score = self._decayed(entry, now) + 1
+            entry.last_access = now
+            entry.loader, entry.ttl = loader, ttl
+        self._ensure_started()
+
+    def _evict_coldest(self, now: float):
+        coldest = min(self._tracked, key=lambda k: self._decayed(self._tracked[k], now))
+        del self._tracked[coldest]
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                        thread_name_prefix="weather-refresh")
+                    self._thread = threading.Thread(target=self._run, name="refresh-ahead", daemon=True)
+                    self._thread.start()
+
+    def due(self) -> List[Hashable]:
+        """Hot keys that should be reloaded now, hottest first"""
+        now = time.monotonic()
+        candidates = []
+        with self._lock:
+            for key, entry in list(self._tracked.items()):
+                score = self._decayed(entry, now)
+                if score < self.min_score:
+                    if score < 0.01:
+                        del self._tracked[key]  # idle long enough to forget
+                    continue
+                if key in self._in_flight:
+                    continue
+                # Only live entries: an expired or evicted key is left to
+                # the next reader's miss rather than recreated for nobody
+                remaining = self.cache.expires_in(key)
+                if remaining is not None and remaining <= entry.lead:
+                    candidates.append((score, key))
+        candidates.sort(key=lambda item: item[0], reverse=True)
+        return [key for _, key in candidates]
+
+    def run_once(self) -> int:
+        """One scheduler pass; returns the number of refreshes started"""
+        started = 0
+        for key in self.due():
+            with self._lock:
+                if len(self._in_flight) >= self.concurrency:
+                    break
+                entry = self._tracked.get(key)
+                if entry is None:
+                    continue
+                if not self.quota.try_acquire():
+                    self.over_quota += 1
+                    break
+                self._in_flight.add(key)
+                entry.lead = self._lead()
+            self._executor.submit(self._refresh, key, entry.loader, entry.ttl)
+            started += 1
+        return started
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float]):
+        try:
+            self.cache.refresh(key, loader, ttl)
+            self.refreshes += 1
+        except Exception as e:
+            # The current entry (if any) stays; users fall back to a normal miss
+            self.failures += 1
+            print(f"Refresh-ahead failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Refresh-ahead pass failed: {e}")
+
+    def stop(self):
+        """Stop the scheduler thread (in-flight refreshes finish)"""
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return refresh counters"""
+        with self._lock:
+            return {
+                'tracked': len(self._tracked),
+                'in_flight': len(self._in_flight),
+                'refreshes': self.refreshes,
+                'failures': self.failures,
+                'over_quota': self.over_quota,
+                'quota_available': self.quota.available()
+            }
+
+
+# Process-wide scheduler over the shared response cache; its thread starts
+# on the first tracked read
+refresh_scheduler: Optional[RefreshScheduler] = None
+if WeatherAppConfig.REFRESH_AHEAD_ENABLED:
+    refresh_scheduler = RefreshScheduler(
+        response_cache,
+        ahead=WeatherAppConfig.REFRESH_AHEAD_SECONDS,
+        jitter=WeatherAppConfig.REFRESH_JITTER,
+        check_interval=WeatherAppConfig.REFRESH_CHECK_INTERVAL,
+        concurrency=WeatherAppConfig.REFRESH_CONCURRENCY,
+        quota_per_minute=WeatherAppConfig.REFRESH_QUOTA_PER_MINUTE,
+        min_score=WeatherAppConfig.REFRESH_MIN_SCORE,
+        half_life=WeatherAppConfig.REFRESH_HALF_LIFE,
+        max_tracked=WeatherAppConfig.REFRESH_MAX_TRACKED
+    )
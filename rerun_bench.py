@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Rerun Cost Benchmark Module
+Headless per-rerun cost of app.py: scripted interactions (search, select
+city, toggle auto-refresh, switch country) are replayed through AppTest
+with a stubbed HTTP transport, and each rerun's script time, CPU time,
+allocations and forward-message (websocket delta) size are reported,
+plus reruns per second per core for capacity planning
+
+    python rerun_bench.py --iterations 10 --json reruns.json
+    python rerun_bench.py --scenarios search,country --no-alloc
+
+Developed by hafizullahkhokhar1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from mock_owm import ROUTES
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+class StubAdapter(BaseAdapter):
+    """
+    Transport adapter that answers OpenWeatherMap and ipinfo requests from
+    mock_owm.py's payload builders without touching the network, so reruns
+    measure the app and not the upstream
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs) -> requests.Response:
+        with self._lock:
+            self.calls += 1
+        parts = urlsplit(request.url)
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        route = ROUTES.get(parts.path)
+        if route is not None:
+            status, body = 200, route(params)
+        elif parts.netloc == urlsplit(_ipinfo_url()).netloc:
+            status, body = 200, {'city': 'Karachi', 'region': 'Sindh', 'country': 'PK', 'loc': '24.8607,67.0011'}
+        else:
+            status, body = 404, {'message': 'Not found'}
+
+        response = requests.Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode('utf-8')
+        response.headers['Content-Type'] = 'application/json'
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def _ipinfo_url() -> str:
+    from config import WeatherAppConfig
+    return WeatherAppConfig.IPINFO_BASE_URL
+
+
+class DeltaCounter:
+    """Forward messages enqueued during a rerun: count and serialized bytes"""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def reset(self):
+        self.messages = 0
+        self.bytes = 0
+
+    def record(self, msg):
+        self.messages += 1
+        self.bytes += msg.ByteSize()
+
+
+@contextmanager
+def capture_deltas(counter: DeltaCounter) -> Iterator[DeltaCounter]:
+    """Count every ForwardMsg the script runner would send to the browser"""
+    from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+
+    original = ForwardMsgQueue.enqueue
+
+    def enqueue(self, msg):
+        counter.record(msg)
+        return original(self, msg)
+
+    ForwardMsgQueue.enqueue = enqueue
+    try:
+        yield counter
+    finally:
+        ForwardMsgQueue.enqueue = original
+
+
+# A scenario is a list of (step name, action); an action takes the AppTest
+# and returns the element it interacted with, so the harness can .run() it
+Step = Tuple[str, Callable[[Any], Any]]
+
+
+def _text_input(at, label_prefix: str):
+    return next(widget for widget in at.text_input if widget.label.startswith(label_prefix))
+
+
+SCENARIOS: Dict[str, List[Step]] = {
+    'search': [
+        ('load', lambda at: at),
+        ('type_query', lambda at: _text_input(at, "🔍 Search").input("Karachi")),
+        ('idle_rerun', lambda at: at),
+        ('new_query', lambda at: _text_input(at, "🔍 Search").input("Lahore")),
+        ('select_city', lambda at: at.selectbox(key="city_select").select_index(
+            min(1, len(at.selectbox(key="city_select").options) - 1)))
+    ],
+    'refresh': [
+        ('load', lambda at: at),
+        ('type_query', lambda at: _text_input(at, "🔍 Search").input("Karachi")),
+        ('refresh_on', lambda at: at.checkbox[0].check()),
+        ('refresh_off', lambda at: at.checkbox[0].uncheck()),
+        ('manual_refresh', lambda at: next(b for b in at.button if b.label.startswith("🔄 Refresh")).click())
+    ],
+    'country': [
+        ('load', lambda at: at),
+        ('browse_mode', lambda at: at.radio[0].set_value("🌍 Browse by Country")),
+        ('pick_country', lambda at: at.selectbox(key="country_select").select("Pakistan")),
+        ('type_city', lambda at: _text_input(at, "🏙️ Enter city").input("Lahore")),
+        ('switch_country', lambda at: at.selectbox(key="country_select").select("Germany")),
+        ('type_city_2', lambda at: _text_input(at, "🏙️ Enter city").input("Berlin"))
+    ]
+}
+
+
+def run_scenario(steps: List[Step], counter: DeltaCounter, track_allocations: bool) -> List[Dict[str, Any]]:
+    """Replay one scenario on a fresh session; one measurement per rerun"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    samples = []
+    for name, action in steps:
+        element = action(at)
+        counter.reset()
+        if track_allocations:
+            tracemalloc.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        element.run()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        sample = {
+            'step': name,
+            'wall_ms': wall * 1000,
+            'cpu_ms': cpu * 1000,
+            'delta_messages': counter.messages,
+            'delta_bytes': counter.bytes,
+            'ok': not at.exception
+        }
+        if track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sample['alloc_peak_kb'] = peak / 1024
+            sample['alloc_retained_kb'] = current / 1024
+        samples.append(sample)
+        if at.exception:
+            print(f"   ⚠️ {name}: {at.exception[0].message}")
+    return samples
+
+
+def summarize(samples: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Median of each step across iterations"""
+    summary = []
+    for position, first in enumerate(samples[0]):
+        runs = [iteration[position] for iteration in samples]
+        row = {'step': first['step'], 'runs': len(runs), 'ok': all(run['ok'] for run in runs)}
+        for field in ('wall_ms', 'cpu_ms', 'delta_messages', 'delta_bytes', 'alloc_peak_kb', 'alloc_retained_kb'):
+            if field in first:
+                row[field] = round(statistics.median(run[field] for run in runs), 2)
+        summary.append(row)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-rerun cost of app.py under AppTest")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="comma-separated scenario names")
+    parser.add_argument('--iterations', type=int, default=10, help="timed runs of each scenario")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs first (warms shared caches)")
+    parser.add_argument('--no-alloc', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--json', help="write the report to this file")
+    args = parser.parse_args(argv)
+
+    # Background refresh threads would add CPU time to whichever rerun they overlap
+    os.environ.setdefault('WEATHER_REFRESH_AHEAD', '0')
+    import transport
+    from benchmarks import environment
+
+    adapter = StubAdapter()
+    session = transport.get_session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    counter = DeltaCounter()
+    report = {'environment': environment(), 'iterations': args.iterations, 'scenarios': {}}
+    total_cpu_ms = 0.0
+    total_reruns = 0
+
+    with capture_deltas(counter):
+        for name in args.scenarios.split(','):
+            steps = SCENARIOS[name]
+            print(f"\n🎬 {name}: {' → '.join(step for step, _ in steps)}")
+            for _ in range(args.warmup):
+                run_scenario(steps, counter, track_allocations=False)
+
+            timed = [run_scenario(steps, counter, track_allocations=False) for _ in range(args.iterations)]
+            summary = summarize(timed)
+            if not args.no_alloc:
+                allocations = summarize([run_scenario(steps, counter, track_allocations=True)])
+                for row, alloc in zip(summary, allocations):
+                    row['alloc_peak_kb'] = alloc['alloc_peak_kb']
+                    row['alloc_retained_kb'] = alloc['alloc_retained_kb']
+
+            total_cpu_ms += sum(sample['cpu_ms'] for iteration in timed for sample in iteration)
+            total_reruns += sum(len(iteration) for iteration in timed)
+            report['scenarios'][name] = summary
+
+            for row in summary:
+                alloc = f" | peak {row['alloc_peak_kb']:8.0f} KB" if 'alloc_peak_kb' in row else ""
+                print(f"   {row['step']:15} wall {row['wall_ms']:7.1f} ms | cpu {row['cpu_ms']:7.1f} ms | "
+                      f"{row['delta_messages']:4.0f} msgs {row['delta_bytes'] / 1024:7.1f} KB{alloc}")
+
+    mean_cpu_ms = total_cpu_ms / max(total_reruns, 1)
+    report['mean_cpu_ms_per_rerun'] = round(mean_cpu_ms, 2)
+    report['reruns_per_core_second'] = round(1000 / mean_cpu_ms, 1) if mean_cpu_ms else None
+    report['upstream_calls'] = adapter.calls
+    print(f"\n⚙️ {report['mean_cpu_ms_per_rerun']} ms CPU per rerun → "
+          f"{report['reruns_per_core_second']} reruns/s per core ({adapter.calls} stubbed upstream calls)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -55,9 +55,7 @@ def check_and_install_dependencies():
     required_packages = {
         'streamlit': 'streamlit>=1.28.0',
         'requests': 'requests>=2.31.0',
-        'pandas': 'pandas>=2.0.0',
         'plotly': 'plotly>=5.15.0',
-        'geocoder': 'geocoder>=1.38.1',
         'pycountry': 'pycountry>=22.3.0'
     }
     
@@ -196,6 +194,63 @@ def open_browser():
         print("   Please manually open: http://localhost:8501")
 
 
+def measure_startup(top: int = 15, output_path: str = None):
+    """
+    Report app.py cold-start import cost using python -X importtime
+    Deferred modules (plotly, pycountry) are measured after app.py and
+    reported separately, since they load on first use
+    """
+    deferred_modules = ['pycountry', 'plotly.graph_objects', 'plotly.subplots']
+    script = "import app\n" + "".join(f"import {name}\n" for name in deferred_modules)
+    
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print("❌ Could not import app.py:")
+        print(result.stderr[-2000:])
+        return None
+    
+    # Lines look like "import time:   self |   cumulative |   package.module".
+    # Nesting is two spaces per level and a module is printed after
+    # everything it imported
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative_us)))
+    
+    app_index = next(i for i, (depth, name, _) in enumerate(entries) if depth == 0 and name == "app")
+    first_child = max((i for i in range(app_index) if entries[i][0] == 0), default=-1) + 1
+    startup = [(name, us) for depth, name, us in entries[first_child:app_index] if depth == 1]
+    deferred = [(name, us) for depth, name, us in entries[app_index + 1:] if depth == 0]
+    startup_ms = entries[app_index][2] / 1000
+    deferred_ms = sum(us for _, us in deferred) / 1000
+    
+    print(f"\n⏱️ Cold start (import app): {startup_ms:.1f} ms")
+    for name, us in sorted(startup, key=lambda item: -item[1])[:top]:
+        print(f"   {us / 1000:8.1f} ms  {name}")
+    print(f"\n⏳ Deferred until first use: {deferred_ms:.1f} ms")
+    for name, us in sorted(deferred, key=lambda item: -item[1]):
+        print(f"   {us / 1000:8.1f} ms  {name}")
+    
+    report = {
+        'startup_ms': round(startup_ms, 1),
+        'deferred_ms': round(deferred_ms, 1),
+        'startup_imports': {name: us for name, us in startup},
+        'deferred_imports': {name: us for name, us in deferred}
+    }
+    if output_path:
+        import json
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {output_path}")
+    return report
+
+
 def show_help():
     """Show help information"""
     print("""
@@ -207,6 +262,7 @@ Usage:
     python run.py --check  - Only check dependencies, don't launch
     python run.py --install - Only install dependencies, don't launch
     python run.py --config - Create Streamlit configuration files
+    python run.py --startup-report [out.json] - Measure cold-start import time
 
 Features:
     ✅ Modern web-based interface with Streamlit
@@ -343,6 +399,11 @@ def main():
             print("\n✅ Installation complete!")
             return
         
+        elif arg in ['--startup-report', 'startup-report']:
+            print("⏱️ Measuring cold-start import time...")
+            measure_startup(output_path=sys.argv[2] if len(sys.argv) > 2 else None)
+            return
+        
         elif arg in ['--config', '-cfg', 'config']:
             print("⚙️ Creating configuration files...")
             create_streamlit_config()
@@ -0,0 +1,45 @@
+import itertools
+import random
+
+import mock_owm
+from advice import advice_engine
+from conditions import Condition
+from config import WeatherAppConfig
+from forecast import ForecastFrame
+
+TEMPERATURES = [-5, 0, 9.9, 10, 15, 20, 25, 30, 39, 40, 45]
+WINDS = [0, 8, 15, 24, 25, 40, 60]
+HUMIDITIES = [10, 25, 40, 60, 70, 85, 99]
+
+
+def test_codes_match_the_config_categories():
+    cases = list(itertools.product(TEMPERATURES, WINDS, HUMIDITIES))
+    temperature, wind, humidity = zip(*cases)
+    codes = advice_engine.classify(temperature, wind, humidity, [Condition.CLEAR] * len(cases))
+
+    for i, (t, w, h) in enumerate(cases):
+        assert advice_engine.temperature_labels[codes['temperature'][i]] == WeatherAppConfig.get_temperature_category(t)
+        assert advice_engine.wind_labels[codes['wind'][i]] == WeatherAppConfig.get_wind_category(w)
+        assert advice_engine.humidity_labels[codes['humidity'][i]] == WeatherAppConfig.get_humidity_category(h)
+
+
+def test_advice_text():
+    advice = WeatherAppConfig.WEATHER_ADVICE
+    text = advice_engine.advise_one({'temperature': 35, 'wind_speed': 30, 'humidity': 50,
+                                     'condition': 'Light Rain'})
+    assert text == ' '.join([advice['temperature']['hot'], advice['conditions']['rain'],
+                             advice['wind']['strong'], advice['humidity']['low']])
+
+
+def test_quiet_categories_are_left_out():
+    advice = WeatherAppConfig.WEATHER_ADVICE
+    text = advice_engine.advise_one({'temperature': 22, 'wind_speed': 5, 'humidity': 65,
+                                     'condition_code': Condition.UNKNOWN})
+    assert text == advice['temperature']['mild']
+
+
+def test_frame_advice_matches_single_observations():
+    frame = ForecastFrame.from_owm(mock_owm.forecast_items(random.Random(3), 1717200000, 40))
+    _, texts = advice_engine.advise_frame(frame)
+    for i in range(len(frame)):
+        assert texts[i] == advice_engine.advise_one(frame.row(i))
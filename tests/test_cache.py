@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from cache import TTLCache
+
+
+def _expired(cache, key, value):
+    cache.set(key, value, ttl=0.01)
+    time.sleep(0.02)
+
+
+def _down():
+    raise ConnectionError("down")
+
+
+def test_stale_value_is_served_while_revalidating():
+    cache = TTLCache(stale_while_revalidate=60)
+    _expired(cache, 'k', 'old')
+    reloaded = threading.Event()
+
+    def loader():
+        reloaded.set()
+        return 'new'
+
+    assert cache.get_or_load('k', loader, ttl=60) == 'old'
+    assert reloaded.wait(5)
+    for _ in range(100):
+        if cache.peek('k') == 'new':
+            break
+        time.sleep(0.01)
+    assert cache.get('k') == 'new'
+    assert cache.stale_served == 1
+
+
+def test_stale_value_is_served_when_loader_fails():
+    cache = TTLCache(stale_if_error=60)
+    _expired(cache, 'k', 'old')
+    assert cache.get_or_load('k', _down) == 'old'
+    assert cache.stale_on_error == 1
+
+
+def test_error_is_raised_without_a_stale_value():
+    cache = TTLCache(stale_if_error=60)
+    with pytest.raises(ConnectionError):
+        cache.get_or_load('k', _down)
+
+
+def test_stale_value_past_grace_is_not_served():
+    cache = TTLCache(stale_if_error=0.01)
+    _expired(cache, 'k', 'old')
+    with pytest.raises(ConnectionError):
+        cache.get_or_load('k', _down)
+
+
+def test_async_stale_value_is_served_when_loader_fails():
+    cache = TTLCache(stale_if_error=60)
+    _expired(cache, 'k', 'old')
+
+    async def loader():
+        _down()
+
+    assert asyncio.run(cache.get_or_load_async('k', loader)) == 'old'
+    assert cache.stale_on_error == 1
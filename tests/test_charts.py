@@ -0,0 +1,25 @@
+import numpy as np
+
+from charts import lttb_indices
+
+
+def test_short_series_is_kept_whole():
+    x = np.arange(10.0)
+    assert lttb_indices(x, x, 10).tolist() == list(range(10))
+    assert lttb_indices(x, x, 2).tolist() == list(range(10))
+
+
+def test_threshold_points_kept_in_order_with_endpoints():
+    x = np.arange(1000.0)
+    y = np.sin(x / 30)
+    keep = lttb_indices(x, y, 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_spike_survives_downsampling():
+    x = np.arange(500.0)
+    y = np.zeros(500)
+    y[237] = 50
+    assert 237 in lttb_indices(x, y, 20).tolist()
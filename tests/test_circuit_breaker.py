@@ -0,0 +1,45 @@
+import pytest
+import requests
+
+from circuit_breaker import CircuitBreaker
+
+
+def _fail():
+    raise requests.exceptions.ConnectionError("down")
+
+
+def _bug():
+    raise ValueError("bad payload")
+
+
+def test_failures_open_the_breaker():
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_non_transport_error_leaves_counters_alone():
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            breaker.call(_fail)
+    with pytest.raises(ValueError):
+        breaker.call(_bug)
+    assert breaker.stats()['consecutive_failures'] == 2
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_non_transport_error_keeps_breaker_half_open():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(_fail)
+    with pytest.raises(ValueError):
+        breaker.call(_bug)  # the probe raises, but not because of the endpoint
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,83 @@
+import pytest
+import requests
+
+import app
+from app import WeatherDashboard
+from cache import SearchCache
+
+
+class Geocoder:
+    def __init__(self, results=None, error=None):
+        self.results = results or []
+        self.error = error
+        self.queries = []
+
+    def __call__(self, query, limit):
+        self.queries.append(query)
+        if self.error:
+            raise self.error
+        return self.results[:limit]
+
+
+def _dashboard(geocoder):
+    dashboard = WeatherDashboard.__new__(WeatherDashboard)  # no session state needed
+    dashboard._fetch_cities = geocoder
+    return dashboard
+
+
+def _names(result):
+    cities, _ = result
+    return [(city['name'], city['country']) for city in cities]
+
+
+PARIS_TX = {'name': 'Paris', 'country': 'US', 'state': 'Texas', 'lat': 33.66, 'lon': -95.55}
+
+
+def test_qualified_query_goes_to_the_geocoder():
+    geocoder = Geocoder([PARIS_TX])
+    result = _dashboard(geocoder)._lookup_cities("Paris, TX", 5, None)
+    assert _names(result) == [('Paris', 'US')]
+    assert geocoder.queries == ["Paris, TX"]
+
+
+def test_full_page_of_prefix_hits_skips_the_geocoder():
+    geocoder = Geocoder([PARIS_TX])
+    result = _dashboard(geocoder)._lookup_cities("Paris", 1, None)
+    assert _names(result) == [('Paris', 'FR')]
+    assert geocoder.queries == []
+
+
+def test_short_page_is_topped_up_from_the_geocoder():
+    geocoder = Geocoder([{'name': 'Paris', 'country': 'FR', 'lat': 48.85, 'lon': 2.35}, PARIS_TX])
+    result = _dashboard(geocoder)._lookup_cities("Paris", 5, None)
+    assert _names(result) == [('Paris', 'FR'), ('Paris', 'US')]
+
+
+def test_typo_matches_only_when_the_geocoder_finds_nothing():
+    geocoder = Geocoder([])
+    result = _dashboard(geocoder)._lookup_cities("Karachy", 5, None)
+    assert _names(result) == [('Karachi', 'PK')]
+    assert geocoder.queries == ["Karachy"]
+
+
+def test_geocoder_failure_is_raised_from_the_loader():
+    geocoder = Geocoder(error=requests.exceptions.ConnectionError("down"))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        _dashboard(geocoder)._lookup_cities("Karachi", 5, None)
+
+
+def test_offline_fallback_is_not_cached(monkeypatch):
+    monkeypatch.setattr(app, 'search_cache', SearchCache())
+    geocoder = Geocoder(error=requests.exceptions.ConnectionError("down"))
+    dashboard = _dashboard(geocoder)
+
+    assert [city['name'] for city in dashboard.search_cities("Karachi")] == ['Karachi']
+    assert app.search_cache.stats()['size'] == 0
+
+    # Once the geocoder recovers, its answer is used and cached
+    geocoder.error = None
+    geocoder.results = [{'name': 'Karachi', 'country': 'PK', 'lat': 24.86, 'lon': 67.01},
+                        {'name': 'Karachi', 'country': 'US', 'lat': 40.0, 'lon': -80.0}]
+    assert len(dashboard.search_cities("Karachi")) == 2
+    assert len(geocoder.queries) == 2
+    assert app.search_cache.stats()['size'] == 1
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+import time
+
+from concurrency import SingleFlight
+
+
+def test_threads_and_coroutines_share_one_flight():
+    flights = SingleFlight('test')
+    calls = []
+
+    def load():
+        calls.append('sync')
+        time.sleep(0.2)
+        return 'value'
+
+    leader = threading.Thread(target=lambda: flights.do('key', load))
+    leader.start()
+    time.sleep(0.05)
+
+    async def follow():
+        async def never():
+            calls.append('async')
+        return await asyncio.gather(*[flights.do_async('key', never) for _ in range(3)])
+
+    assert asyncio.run(follow()) == ['value'] * 3
+    leader.join()
+    assert calls == ['sync']
+    assert flights.stats()['coalesced'] == 3
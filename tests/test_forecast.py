@@ -0,0 +1,54 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import mock_owm
+from forecast import ForecastFrame
+
+
+def _items(count=40, seed=7):
+    start = int(datetime(2024, 6, 1).timestamp())
+    return mock_owm.forecast_items(random.Random(seed), start, count)
+
+
+def test_columns_match_the_response():
+    items = _items()
+    frame = ForecastFrame.from_owm(items)
+    assert len(frame) == len(items)
+    assert frame.temperature[3] == round(items[3]['main']['temp'])
+    assert frame.wind_speed[3] == round(items[3]['wind']['speed'] * 3.6)
+    assert frame.row(3)['datetime'] == datetime.fromtimestamp(items[3]['dt'])
+
+
+def test_daily_aggregates_match_a_plain_loop():
+    frame = ForecastFrame.from_owm(_items())
+    rows = [frame.row(i) for i in range(len(frame))]
+    day = datetime(2024, 6, 2).date()
+    temps = [row['temperature'] for row in rows if row['datetime'].date() == day]
+    noon = next(row for row in rows if row['datetime'].date() == day and row['datetime'].hour >= 12)
+
+    summary = frame.day_summary(day)
+    assert (summary['min'], summary['max']) == (min(temps), max(temps))
+    assert summary['mean'] == sum(temps) / len(temps)
+    assert summary['rep'] == noon
+    assert frame.day_summary(day + timedelta(days=30)) is None
+
+
+def test_head_is_a_prefix():
+    frame = ForecastFrame.from_owm(_items())
+    head = frame.head(8)
+    assert len(head) == 8
+    assert np.array_equal(head.temperature, frame.temperature[:8])
+    assert head is frame.head(8)
+
+
+def test_fingerprint_follows_content():
+    assert ForecastFrame.from_owm(_items()).fingerprint() == ForecastFrame.from_owm(_items()).fingerprint()
+    assert ForecastFrame.from_owm(_items()).fingerprint() != ForecastFrame.from_owm(_items(seed=8)).fingerprint()
+
+
+def test_empty_frame():
+    frame = ForecastFrame.from_owm([])
+    assert len(frame) == 0
+    assert len(frame.daily()['date']) == 0
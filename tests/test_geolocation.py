@@ -0,0 +1,36 @@
+import pytest
+import requests
+
+import circuit_breaker
+import geolocation
+import transport
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from config import WeatherAppConfig
+
+
+class DownSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        raise requests.exceptions.ConnectionError(f"{url} unreachable")
+
+
+def test_failures_across_ips_open_one_provider_breaker(monkeypatch):
+    session = DownSession()
+    monkeypatch.setattr(circuit_breaker, '_breakers', {})
+    monkeypatch.setattr(transport, 'get_session', lambda: session)
+
+    threshold = WeatherAppConfig.BREAKER_FAILURE_THRESHOLD
+    for i in range(threshold):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            geolocation._from_ipinfo(f"8.8.4.{i}")
+
+    assert list(circuit_breaker._breakers) == ['ipinfo.io']
+    assert circuit_breaker._breakers['ipinfo.io'].state == CircuitBreaker.OPEN
+
+    # A new address is rejected by the open breaker without a request
+    with pytest.raises(CircuitOpenError):
+        geolocation._from_ipinfo("1.1.1.1")
+    assert session.calls == threshold
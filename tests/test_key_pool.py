@@ -0,0 +1,32 @@
+import requests
+
+from key_pool import ApiKeyPool, retry_after
+
+
+def _disabled_for(pool):
+    return pool.stats()[0]['disabled_for']
+
+
+def test_retry_after_is_used_as_is():
+    pool = ApiKeyPool(['key-a'], backoff_base=60)
+    pool.report('key-a', 429, retry_after=2)
+    assert 1 < _disabled_for(pool) <= 2
+
+
+def test_backoff_without_retry_after():
+    pool = ApiKeyPool(['key-a'], backoff_base=60, backoff_max=3600)
+    pool.report('key-a', 429)
+    assert 59 < _disabled_for(pool) <= 60
+    pool.report('key-a', 429)
+    assert 119 < _disabled_for(pool) <= 120
+
+
+def test_retry_after_header_formats():
+    response = requests.Response()
+    assert retry_after(response.headers) is None
+    response.headers['retry-after'] = '7'
+    assert retry_after(response.headers) == 7.0
+    response.headers['Retry-After'] = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    assert retry_after(response.headers) < 0
+    response.headers['Retry-After'] = 'soon'
+    assert retry_after(response.headers) is None
@@ -0,0 +1,20 @@
+import threading
+
+from persistent_cache import PersistentCache
+
+
+def test_unpicklable_value_does_not_stop_the_writer(tmp_path):
+    cache = PersistentCache(str(tmp_path / 'cache.sqlite'))
+    try:
+        cache.put('lock', threading.Lock(), ttl=60)
+        cache.flush()
+        cache.put('lambda', lambda: None, ttl=60)
+        cache.put('weather', {'temperature': 21.5}, ttl=60)
+        cache.flush()
+
+        assert cache._writer.is_alive()
+        assert cache.get('weather')[0] == {'temperature': 21.5}
+        assert cache.get('lock') == (None, 0)
+        assert cache.get('lambda') == (None, 0)
+    finally:
+        cache.close()
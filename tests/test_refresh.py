@@ -0,0 +1,65 @@
+from cache import TTLCache
+from refresh import RefreshScheduler
+
+
+def _scheduler(cache, **kwargs):
+    options = dict(ahead=30, jitter=0, min_score=2, half_life=600)
+    options.update(kwargs)
+    return RefreshScheduler(cache, **options)
+
+
+def _read(scheduler, key, times):
+    for _ in range(times):
+        scheduler.track(key, lambda: 'fresh', ttl=600)
+
+
+def test_hot_entry_near_expiry_is_due():
+    cache = TTLCache()
+    scheduler = _scheduler(cache)
+    cache.set('hot', 'old', ttl=10)
+    cache.set('later', 'old', ttl=300)
+    _read(scheduler, 'hot', 3)
+    _read(scheduler, 'later', 3)
+    try:
+        assert scheduler.due() == ['hot']
+    finally:
+        scheduler.stop()
+
+
+def test_cold_entry_is_not_due():
+    cache = TTLCache()
+    scheduler = _scheduler(cache)
+    cache.set('cold', 'old', ttl=10)
+    _read(scheduler, 'cold', 1)
+    try:
+        assert scheduler.due() == []
+    finally:
+        scheduler.stop()
+
+
+def test_missing_entry_is_not_recreated():
+    cache = TTLCache()
+    scheduler = _scheduler(cache)
+    cache.set('evicted', 'old', ttl=10)
+    _read(scheduler, 'evicted', 5)
+    cache.invalidate('evicted')
+    try:
+        assert scheduler.due() == []
+        assert scheduler.run_once() == 0
+        assert 'evicted' not in cache
+    finally:
+        scheduler.stop()
+
+
+def test_run_once_reloads_due_entries():
+    cache = TTLCache()
+    scheduler = _scheduler(cache)
+    cache.set('hot', 'old', ttl=10)
+    _read(scheduler, 'hot', 3)
+    try:
+        assert scheduler.run_once() == 1
+        scheduler._executor.shutdown(wait=True)
+        assert cache.get('hot') == 'fresh'
+        assert scheduler.stats()['refreshes'] == 1
+    finally:
+        scheduler.stop()
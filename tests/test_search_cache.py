@@ -0,0 +1,56 @@
+from cache import SearchCache
+
+LONDON_GB = {'name': 'London', 'country': 'GB', 'lat': 51.51, 'lon': -0.13}
+LONDON_CA = {'name': 'London', 'country': 'CA', 'lat': 42.98, 'lon': -81.25}
+LONDONDERRY = {'name': 'Londonderry', 'country': 'GB', 'lat': 55.0, 'lon': -7.31}
+
+
+class Loader:
+    def __init__(self, results, local_only):
+        self.results = results
+        self.local_only = local_only
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.results, self.local_only
+
+
+def test_local_only_answer_is_reused_for_longer_queries():
+    cache = SearchCache()
+    cache.get_or_load("Lond", None, 5, Loader([LONDON_GB, LONDONDERRY], local_only=True))
+
+    longer = Loader([LONDON_GB, LONDON_CA], local_only=False)
+    assert cache.get_or_load("London", None, 5, longer) == [LONDON_GB, LONDONDERRY]
+    assert longer.calls == 0
+    assert cache.stats()['prefix_hits'] == 1
+
+
+def test_answer_with_geocoder_results_is_not_reused():
+    cache = SearchCache()
+    cache.get_or_load("Lond", None, 5, Loader([LONDON_GB], local_only=False))
+
+    longer = Loader([LONDON_GB, LONDON_CA], local_only=False)
+    assert cache.get_or_load("London", None, 5, longer) == [LONDON_GB, LONDON_CA]
+    assert longer.calls == 1
+    assert cache.stats()['prefix_hits'] == 0
+
+
+def test_truncated_answer_is_not_reused():
+    cache = SearchCache()
+    cache.get_or_load("Lond", None, 2, Loader([LONDON_GB, LONDONDERRY], local_only=True))
+
+    longer = Loader([LONDON_GB], local_only=True)
+    cache.get_or_load("London", None, 2, longer)
+    assert longer.calls == 1
+
+
+def test_each_lookup_counts_one_hit_or_miss():
+    cache = SearchCache()
+    loader = Loader([LONDON_GB], local_only=False)
+    cache.get_or_load("London", None, 5, loader)
+    cache.get_or_load("london ", None, 5, loader)
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert loader.calls == 1
@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+import async_weather
+import weather
+from async_weather import AsyncWeatherAPI
+from cache import TTLCache
+from weather import WeatherAPI
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = TTLCache(name="test", stale_if_error=60)
+    monkeypatch.setattr(weather, 'response_cache', cache)
+    monkeypatch.setattr(async_weather, 'response_cache', cache)
+    return cache
+
+
+def _down(*args):
+    raise requests.exceptions.ConnectionError("down")
+
+
+async def _down_async(*args):
+    _down()
+
+
+def _sync_weather(city):
+    api = WeatherAPI()
+    api._get_weather_from_api = _down
+    return api.get_weather(city)
+
+
+def _async_weather(city):
+    api = AsyncWeatherAPI()
+    api._get_weather_from_api = _down_async
+    return asyncio.run(api.get_weather(city))
+
+
+@pytest.mark.parametrize('get_weather', [_sync_weather, _async_weather])
+def test_stale_value_then_demo_data(cache, get_weather):
+    key = WeatherAPI()._weather_key('Karachi')
+    cache.set(key, {'city': 'Karachi', 'temperature': 31}, ttl=0.01)
+    time.sleep(0.02)
+    assert get_weather('Karachi')['temperature'] == 31
+
+    cache.clear()
+    assert get_weather('Karachi')['temperature'] == 28  # demo data
+    assert get_weather('Atlantis') is None
+
+
+def test_demo_forecast_is_deterministic():
+    api = WeatherAPI()
+    first = api._get_demo_forecast('Karachi', 2)
+    assert first == api._get_demo_forecast('Karachi', 2)
+    assert len(first['forecasts']) == 16
+    assert api._get_demo_forecast('Atlantis', 2) is None
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport Module
+Single pooled, keep-alive HTTP session shared by app.py and weather.py,
+with a circuit breaker per upstream endpoint
+
+Developed by hafizullahkhokhar1
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import WeatherAppConfig
+from circuit_breaker import endpoint_name, get_breaker
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    """Create a session with per-host connection pools"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=WeatherAppConfig.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=WeatherAppConfig.HTTP_POOL_MAXSIZE,
+        pool_block=False
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'User-Agent': f"{WeatherAppConfig.APP_NAME}/{WeatherAppConfig.APP_VERSION}"
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide HTTP session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def http_get(url: str, params: Optional[Dict[str, Any]] = None,
+             timeout: Optional[float] = None, breaker: Optional[str] = None) -> requests.Response:
+    """
+    GET through the shared session
+    Connections to the same host are reused across calls and threads. Each
+    endpoint has a process-wide circuit breaker: while it is open this
+    raises CircuitOpenError at once instead of waiting for a timeout.
+    Pass breaker to share one breaker across URLs whose path varies per
+    call (e.g. an IP address in the path).
+    """
+    if timeout is None:
+        timeout = WeatherAppConfig.API_TIMEOUT
+    return get_breaker(breaker or endpoint_name(url)).call(
+        lambda: get_session().get(url, params=params, timeout=timeout),
+        is_failure=lambda response: response.status_code >= 500
+    )
+
+
+def close_session():
+    """Close pooled connections (the next call opens a fresh session)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -6,34 +6,33 @@ Handles OpenWeatherMap API calls and location services
 Developed by hafizullahkhokhar1
 """
 
-import requests
-import json
-from typing import Dict, Optional, Any
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional, Any, Iterable, Iterator, Tuple, Union
+from datetime import datetime
+
+from transport import http_get
+from concurrency import fan_out
+from cache import response_cache, get_ttl
+from key_pool import owm_get, weather_key_pool
+from geolocation import locate
+from config import WeatherAppConfig
+from city_index import get_city_index, country_name
+from conditions import classify_text, classify_weather, condition_icon
+
+
+# A city name ("Karachi") or a (latitude, longitude) pair
+Location = Union[str, Tuple[float, float]]
 
 
 class WeatherAPI:
     def __init__(self):
-        # Free API keys (these are publicly available demo keys)
-        # Users should get their own keys for production use
-        self.openweather_api_keys = [
-            "bd5e378503939ddaee76f12ad7a97608",  # Demo key 1
-            "2a0b95b4a5b5b4a5b5b4a5b5b4a5b5b4",  # Demo key 2 
-            "5f2b88c4f2b88c4f2b88c4f2b88c4f2b",  # Demo key 3
-            "your_openweather_api_key_here"       # User should replace this
-        ]
-        
-        self.ipinfo_api_keys = [
-            "1a2b3c4d5e6f7g",  # Demo token for location
-            "your_ipinfo_token_here"  # User should replace this
-        ]
-        
-        self.current_weather_key_index = 0
-        self.current_location_key_index = 0
+        # OpenWeatherMap keys (WeatherAppConfig.OPENWEATHER_API_KEYS) are shared
+        # process-wide, with per-key rate limits and health tracking
+        self.key_pool = weather_key_pool
         
         # API endpoints
-        self.weather_base_url = "https://api.openweathermap.org/data/2.5"
-        self.location_base_url = "https://ipinfo.io"
+        self.weather_base_url = WeatherAppConfig.OPENWEATHER_BASE_URL
+        self.location_base_url = WeatherAppConfig.IPINFO_BASE_URL
         
         # Backup weather data for demo purposes
         self.demo_weather_data = {
@@ -78,62 +77,70 @@ class WeatherAPI:
                 "condition": "Cloudy"
             }
         }
+        for demo in self.demo_weather_data.values():
+            demo['condition_code'] = classify_text(demo['condition'])
     
-    def get_next_weather_api_key(self) -> str:
-        """Get next available OpenWeather API key"""
-        key = self.openweather_api_keys[self.current_weather_key_index]
-        self.current_weather_key_index = (self.current_weather_key_index + 1) % len(self.openweather_api_keys)
-        return key
+    def _location_params(self, location: Location) -> Dict[str, Any]:
+        """Build OpenWeatherMap query params for a city name or coordinates"""
+        if isinstance(location, str):
+            return {'q': location}
+        lat, lon = location
+        return {'lat': lat, 'lon': lon}
     
-    def get_next_location_api_key(self) -> str:
-        """Get next available location API key"""
-        key = self.ipinfo_api_keys[self.current_location_key_index]
-        self.current_location_key_index = (self.current_location_key_index + 1) % len(self.ipinfo_api_keys)
-        return key
+    def _location_key(self, location: Location) -> Tuple:
+        """Normalized identity of a location, used to dedupe batches"""
+        if isinstance(location, str):
+            return ('city', ' '.join(location.lower().split()))
+        lat, lon = location
+        precision = WeatherAppConfig.CACHE_COORD_PRECISION
+        return ('coords', round(float(lat), precision), round(float(lon), precision))
     
-    def get_weather(self, city: str) -> Optional[Dict[str, Any]]:
+    def get_weather(self, city: Location) -> Optional[Dict[str, Any]]:
         """
         Get weather data for a city
-        First tries OpenWeatherMap API, falls back to demo data
+        Served through the shared cache: concurrent lookups share one API call,
+        and during an outage the last good value is returned for a grace
+        period. Demo data is the last resort for the built-in demo cities.
         """
         try:
-            return self._get_weather_from_api(city)
+            result = response_cache.get_or_load(self._weather_key(city),
+                                                lambda: self._get_weather_from_api(city),
+                                                ttl=get_ttl('weather'))
         except Exception as e:
             print(f"API call failed: {e}")
-            return self._get_demo_weather_data(city)
+            result = self._get_demo_weather_data(city)
+        # Cached dicts are shared; hand each caller its own copy
+        return result.copy() if result else result
     
-    def _get_weather_from_api(self, city: str) -> Optional[Dict[str, Any]]:
-        """Get weather data from OpenWeatherMap API"""
-        api_key = self.get_next_weather_api_key()
-        
+    def _weather_key(self, city: Location) -> Tuple:
+        return ('api_weather', self._location_key(city))
+    
+    def _forecast_key(self, city: Location, days: int) -> Tuple:
+        return ('api_forecast', self._location_key(city), days)
+    
+    def _get_weather_from_api(self, city: Location) -> Optional[Dict[str, Any]]:
+        """
+        Get weather data from OpenWeatherMap API
+        Returns None for an unknown city; raises on any other failure
+        """
         # Current weather endpoint
         url = f"{self.weather_base_url}/weather"
         params = {
-            'q': city,
-            'appid': api_key,
+            **self._location_params(city),
             'units': 'metric'  # Celsius
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_weather_response(data)
-            elif response.status_code == 401:
-                print("Invalid API key, trying backup...")
-                # Try with different key or fall back to demo
-                return self._get_demo_weather_data(city)
-            elif response.status_code == 404:
-                print(f"City '{city}' not found")
-                return None
-            else:
-                print(f"API error: {response.status_code}")
-                return self._get_demo_weather_data(city)
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Network error: {e}")
-            return self._get_demo_weather_data(city)
+        # A 401/429 on one key is retried on the others
+        response = owm_get(url, params=params, timeout=10, pool=self.key_pool)
+        
+        if response.status_code == 404:
+            print(f"City '{city}' not found")
+            return None
+        if response.status_code == 401:
+            print("No valid API key")
+        response.raise_for_status()
+        
+        return self._parse_weather_response(response.json())
     
     def _parse_weather_response(self, data: Dict) -> Dict[str, Any]:
         """Parse OpenWeatherMap API response"""
@@ -146,87 +153,48 @@ class WeatherAPI:
                 'humidity': data['main']['humidity'],
                 'wind_speed': round(data['wind']['speed'] * 3.6),  # Convert m/s to km/h
                 'pressure': data['main']['pressure'],
-                'condition': data['weather'][0]['description']
+                'condition': data['weather'][0]['description'],
+                'condition_code': classify_weather(data['weather'][0]),
+                'timestamp': datetime.now()
             }
         except KeyError as e:
             print(f"Error parsing weather data: {e}")
             raise
     
-    def _get_demo_weather_data(self, city: str) -> Optional[Dict[str, Any]]:
-        """Get demo weather data for major cities"""
+    def _get_demo_weather_data(self, city: Location) -> Optional[Dict[str, Any]]:
+        """Get demo weather data for the built-in demo cities (None for any other place)"""
+        if not isinstance(city, str):
+            return None  # no demo data for bare coordinates
+        
         city_lower = city.lower().strip()
         
         # Check for exact matches first
         if city_lower in self.demo_weather_data:
             return self.demo_weather_data[city_lower].copy()
         
-        # Check for partial matches
+        # Check for partial matches ("Karachi, Pakistan")
         for demo_city, data in self.demo_weather_data.items():
-            if demo_city in city_lower or city_lower in demo_city:
-                result = data.copy()
-                result['city'] = city.title()  # Use the searched city name
-                return result
+            if demo_city in city_lower:
+                return data.copy()
         
-        # Default fallback for any other city
-        import random
-        return {
-            'city': city.title(),
-            'country': 'Unknown',
-            'temperature': random.randint(15, 35),
-            'feels_like': random.randint(15, 40),
-            'humidity': random.randint(40, 80),
-            'wind_speed': random.randint(5, 25),
-            'pressure': random.randint(1000, 1030),
-            'condition': random.choice(['Clear Sky', 'Partly Cloudy', 'Cloudy', 'Light Rain'])
-        }
+        return None
     
-    def get_current_location(self) -> Optional[Dict[str, Any]]:
+    def get_current_location(self, ip: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get current location using IP geolocation
+        ip is the client's address; without it the server's own address is located.
         Returns location data including city name
         """
         try:
-            return self._get_location_from_api()
+            location = self._get_location_from_api(ip)
         except Exception as e:
             print(f"Location API failed: {e}")
-            return self._get_default_location()
+            location = None
+        return location or self._get_default_location()
     
-    def _get_location_from_api(self) -> Optional[Dict[str, Any]]:
-        """Get location from IP geolocation service"""
-        # Try ipinfo.io first
-        try:
-            url = f"{self.location_base_url}/json"
-            response = requests.get(url, timeout=5)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'city': data.get('city', 'Unknown'),
-                    'region': data.get('region', 'Unknown'),
-                    'country': data.get('country', 'Unknown'),
-                    'latitude': float(data.get('loc', '0,0').split(',')[0]),
-                    'longitude': float(data.get('loc', '0,0').split(',')[1])
-                }
-        except Exception as e:
-            print(f"ipinfo.io failed: {e}")
-        
-        # Try alternative free services
-        alternative_services = [
-            "https://httpbin.org/ip",  # Just IP
-            "https://api.ipify.org?format=json",  # Just IP
-        ]
-        
-        for service_url in alternative_services:
-            try:
-                response = requests.get(service_url, timeout=5)
-                if response.status_code == 200:
-                    print(f"Got IP from {service_url}")
-                    # For demo purposes, return default location
-                    return self._get_default_location()
-            except Exception:
-                continue
-        
-        return None
+    def _get_location_from_api(self, ip: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get location from the fastest IP geolocation service (cached per IP)"""
+        return locate(ip)
     
     def _get_default_location(self) -> Dict[str, Any]:
         """Return default location (Karachi, Pakistan)"""
@@ -238,39 +206,41 @@ class WeatherAPI:
             'longitude': 67.0011
         }
     
-    def get_forecast(self, city: str, days: int = 5) -> Optional[Dict[str, Any]]:
+    def get_forecast(self, city: Location, days: int = 5) -> Optional[Dict[str, Any]]:
         """
         Get weather forecast for a city
+        Cached like get_weather, including the stale fallback during outages
         """
         try:
-            return self._get_forecast_from_api(city, days)
+            result = response_cache.get_or_load(self._forecast_key(city, days),
+                                                lambda: self._get_forecast_from_api(city, days),
+                                                ttl=get_ttl('forecast'))
         except Exception as e:
             print(f"Forecast API failed: {e}")
-            return self._get_demo_forecast(city, days)
+            result = self._get_demo_forecast(city, days)
+        if result:
+            result = {**result, 'forecasts': [f.copy() for f in result['forecasts']]}
+        return result
     
-    def _get_forecast_from_api(self, city: str, days: int) -> Optional[Dict[str, Any]]:
-        """Get forecast from OpenWeatherMap API"""
-        api_key = self.get_next_weather_api_key()
-        
+    def _get_forecast_from_api(self, city: Location, days: int) -> Optional[Dict[str, Any]]:
+        """
+        Get forecast from OpenWeatherMap API
+        Returns None for an unknown city; raises on any other failure
+        """
         url = f"{self.weather_base_url}/forecast"
         params = {
-            'q': city,
-            'appid': api_key,
+            **self._location_params(city),
             'units': 'metric',
             'cnt': days * 8  # 8 forecasts per day (every 3 hours)
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self._parse_forecast_response(data)
-            else:
-                return self._get_demo_forecast(city, days)
-                
-        except requests.exceptions.RequestException:
-            return self._get_demo_forecast(city, days)
+        response = owm_get(url, params=params, timeout=10, pool=self.key_pool)
+        
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        
+        return self._parse_forecast_response(response.json())
     
     def _parse_forecast_response(self, data: Dict) -> Dict[str, Any]:
         """Parse OpenWeatherMap forecast API response"""
@@ -282,6 +252,7 @@ class WeatherAPI:
                     'datetime': item['dt_txt'],
                     'temperature': round(item['main']['temp']),
                     'condition': item['weather'][0]['description'],
+                    'condition_code': classify_weather(item['weather'][0]),
                     'humidity': item['main']['humidity'],
                     'wind_speed': round(item['wind']['speed'] * 3.6)
                 }
@@ -290,38 +261,46 @@ class WeatherAPI:
             return {
                 'city': data['city']['name'],
                 'country': data['city']['country'],
-                'forecasts': forecasts
+                'forecasts': forecasts,
+                'timestamp': datetime.now()
             }
             
         except KeyError as e:
             print(f"Error parsing forecast data: {e}")
             raise
     
-    def _get_demo_forecast(self, city: str, days: int) -> Dict[str, Any]:
-        """Generate demo forecast data"""
-        import random
-        from datetime import datetime, timedelta
+    # Demo temperature offset (°C) for each 3-hour slot of the day, from midnight
+    DEMO_DAILY_CYCLE = (-4, -5, -3, 0, 3, 4, 2, -1)
+
+    def _get_demo_forecast(self, city: Location, days: int,
+                           current_weather: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build a demo forecast from the demo current weather
+        (only the built-in demo cities have any): a fixed daily temperature
+        cycle with the current conditions, the same on every call
+        """
+        from datetime import timedelta
         
-        current_weather = self.get_weather(city)
+        if current_weather is None:
+            current_weather = self._get_demo_weather_data(city)
         if not current_weather:
             return None
         
-        forecasts = []
-        base_temp = current_weather['temperature']
+        # 3-hourly slots starting at the next slot boundary
+        now = datetime.now()
+        start = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=3 - now.hour % 3)
         
-        for day in range(days):
-            for hour in range(0, 24, 3):  # Every 3 hours
-                forecast_time = datetime.now() + timedelta(days=day, hours=hour)
-                temp_variation = random.randint(-5, 5)
-                
-                forecast = {
-                    'datetime': forecast_time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'temperature': max(0, base_temp + temp_variation),
-                    'condition': random.choice(['Clear', 'Partly Cloudy', 'Cloudy', 'Light Rain']),
-                    'humidity': random.randint(40, 80),
-                    'wind_speed': random.randint(5, 25)
-                }
-                forecasts.append(forecast)
+        forecasts = []
+        for step in range(days * 8):
+            forecast_time = start + timedelta(hours=3 * step)
+            forecasts.append({
+                'datetime': forecast_time.strftime('%Y-%m-%d %H:%M:%S'),
+                'temperature': current_weather['temperature'] + self.DEMO_DAILY_CYCLE[forecast_time.hour // 3],
+                'condition': current_weather['condition'],
+                'condition_code': current_weather['condition_code'],
+                'humidity': current_weather['humidity'],
+                'wind_speed': current_weather['wind_speed']
+            })
         
         return {
             'city': current_weather['city'],
@@ -329,11 +308,78 @@ class WeatherAPI:
             'forecasts': forecasts
         }
     
+    def get_weather_and_forecast(self, city: str, days: int = 5,
+                                 timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get current weather and forecast for a city concurrently
+        Both calls share one deadline; whichever misses it comes back as
+        None with its error under 'errors'
+        """
+        results, errors = fan_out({
+            'weather': lambda: self.get_weather(city),
+            'forecast': lambda: self.get_forecast(city, days)
+        }, deadline=timeout)
+        
+        for name, error in errors.items():
+            print(f"{name} fetch failed for '{city}': {error}")
+        
+        return {
+            'weather': results.get('weather'),
+            'forecast': results.get('forecast'),
+            'errors': errors
+        }
+    
+    def get_weather_many(self, locations: Iterable[Location],
+                         max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Get current weather for many cities or coordinates
+        Yields {'location', 'data', 'error'} as each lookup completes
+        """
+        return self._run_many(self.get_weather, locations, max_workers)
+    
+    def get_forecast_many(self, locations: Iterable[Location], days: int = 5,
+                          max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Get forecasts for many cities or coordinates
+        Yields {'location', 'data', 'error'} as each lookup completes
+        """
+        return self._run_many(lambda location: self.get_forecast(location, days), locations, max_workers)
+    
+    def _run_many(self, fetch, locations: Iterable[Location],
+                  max_workers: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """
+        Dedupe locations and run fetch over them on a bounded worker pool
+        Results are streamed in completion order; an exception in one
+        lookup is reported in its 'error' field and the batch carries on
+        """
+        unique = {}
+        for location in locations:
+            unique.setdefault(self._location_key(location), location)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers or WeatherAppConfig.BATCH_WORKERS,
+                                      thread_name_prefix="weather-batch")
+        try:
+            futures = {executor.submit(fetch, location): location for location in unique.values()}
+            for future in as_completed(futures):
+                location = futures[future]
+                try:
+                    yield {'location': location, 'data': future.result(), 'error': None}
+                except Exception as e:
+                    yield {'location': location, 'data': None, 'error': e}
+        finally:
+            # Also runs when the consumer stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def search_cities(self, query: str, limit: int = 5) -> list:
         """
         Search for cities matching the query
         Returns list of city suggestions
         """
+        index = get_city_index()
+        if index is not None:
+            return [f"{city['name']}, {country_name(city['country'])}"
+                    for city in index.search(query, limit)]
+        
         # Demo city suggestions based on common searches
         all_cities = [
             "Karachi, Pakistan", "Lahore, Pakistan", "Islamabad, Pakistan",
@@ -360,7 +406,7 @@ class WeatherAPI:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=5)
+            response = http_get(url, params=params, timeout=5)
             return response.status_code == 200
         except Exception:
             return False
@@ -379,24 +425,7 @@ def ms_to_kmh(ms: float) -> int:
 
 def get_weather_emoji(condition: str) -> str:
     """Get emoji for weather condition"""
-    condition_lower = condition.lower()
-    
-    if 'clear' in condition_lower or 'sunny' in condition_lower:
-        return '☀️'
-    elif 'cloud' in condition_lower:
-        return '☁️'
-    elif 'rain' in condition_lower:
-        return '🌧️'
-    elif 'drizzle' in condition_lower:
-        return '🌦️'
-    elif 'thunderstorm' in condition_lower or 'storm' in condition_lower:
-        return '⛈️'
-    elif 'snow' in condition_lower:
-        return '❄️'
-    elif 'mist' in condition_lower or 'fog' in condition_lower:
-        return '🌫️'
-    else:
-        return '🌤️'
+    return condition_icon(classify_text(condition))
 
 
 if __name__ == "__main__":